@@ -0,0 +1,139 @@
+# address_keys.py
+"""
+Canonical keys for addresses and community names
+The VBA export, the workbook's Customers sheet and lot_pairs.json spell the
+same place differently ("Canal  Landing", "4744 W Quinault" vs
+"4744 W. Quinault Pl"). Lookups go through canonical keys instead of the raw
+strings: case-folded, whitespace collapsed, punctuation dropped, street
+suffixes / directions / unit designators abbreviated the same way.
+
+AddressIndex maps canonical keys to values. A key that is still not found is
+resolved once among entries with the same house and unit numbers and the
+same street name: a suffix or direction may be left out ("4744 W Quinault"
+finds "4744 W. Quinault Pl") but not differ ("346 Stockton St" never finds
+"346 Stockton Ct", another customer's house), and an address that fits more
+than one entry matches none. The result is memoized for the life of the
+index, i.e. one resolution per address per workbook version.
+"""
+
+import re
+import logging
+from functools import lru_cache
+
+_SUFFIXES = {
+    'street': 'st', 'str': 'st', 'place': 'pl', 'avenue': 'ave', 'av': 'ave',
+    'drive': 'dr', 'road': 'rd', 'court': 'ct', 'lane': 'ln', 'boulevard': 'blvd',
+    'circle': 'cir', 'terrace': 'ter', 'parkway': 'pkwy', 'highway': 'hwy', 'trail': 'trl'
+}
+_DIRECTIONS = {
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+    'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw'
+}
+_UNITS = {'apartment': 'unit', 'apt': 'unit', 'suite': 'unit', 'ste': 'unit', '#': 'unit'}
+_TOKENS = {**_SUFFIXES, **_DIRECTIONS, **_UNITS}
+_SUFFIX_KEYS = frozenset(_SUFFIXES.values())
+_DIRECTION_KEYS = frozenset(_DIRECTIONS.values())
+
+_PUNCTUATION = re.compile(r"[.,;:'\"()]")
+_SEPARATORS = re.compile(r'\s*([/#&])\s*')
+_NUMBERS = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=4096)
+def address_key(text):
+    """Canonical form of an address ('4744 W. Quinault  Place' -> '4744 w quinault pl')"""
+    if not isinstance(text, str):
+        return None
+    text = _PUNCTUATION.sub('', text.casefold())
+    text = _SEPARATORS.sub(r' \1 ', text)
+    tokens = [_TOKENS.get(token, token) for token in text.split()]
+    # '# 5' / 'unit unit 5' -> 'unit 5'
+    tokens = [token for index, token in enumerate(tokens)
+              if not (token == 'unit' and index + 1 < len(tokens) and tokens[index + 1] == 'unit')]
+    return ' '.join(tokens)
+
+
+@lru_cache(maxsize=256)
+def community_key(text):
+    """Canonical form of a community name ('Canal  Landing' -> 'canal landing')"""
+    if not isinstance(text, str):
+        return None
+    return ' '.join(text.split()).casefold()
+
+
+def _street_parts(canonical):
+    """Street name tokens, suffixes and directions of a canonical address"""
+    name, suffixes, directions = [], [], []
+    for token in canonical.split():
+        if token in _SUFFIX_KEYS:
+            suffixes.append(token)
+        elif token in _DIRECTION_KEYS:
+            directions.append(token)
+        elif token != 'unit':
+            name.append(token)
+    return tuple(name), tuple(suffixes), tuple(directions)
+
+
+def _same_street(parts, other):
+    """Same name; suffixes / directions only have to agree where both addresses give them"""
+    return parts[0] == other[0] and all(
+        not mine or not theirs or mine == theirs for mine, theirs in zip(parts[1:], other[1:])
+    )
+
+
+class AddressIndex:
+    """Lookup by canonical address key with a memoized, street-exact fallback"""
+
+    def __init__(self, mapping=None, key=address_key):
+        """
+        Args:
+            mapping: dict of raw address -> value (e.g. the Customers sheet rows)
+            key: Canonicalizing function
+        """
+        self.key = key
+        self._values = {}
+        self._by_numbers = {}
+        self._resolved = {}
+        self.stats = {'exact': 0, 'partial': 0, 'missed': 0}
+        for raw, value in (mapping or {}).items():
+            self.add(raw, value)
+
+    def add(self, raw, value):
+        canonical = self.key(raw)
+        if canonical is None:
+            return
+        if canonical in self._values:
+            logging.warning(f"Duplicate address after normalization: {raw!r}")
+            return
+        self._values[canonical] = value
+        self._by_numbers.setdefault(tuple(_NUMBERS.findall(canonical)), []).append(canonical)
+        self._resolved.clear()
+
+    def __len__(self):
+        return len(self._values)
+
+    def resolve(self, raw):
+        """Canonical key of the entry `raw` refers to, None if there is none"""
+        canonical = self.key(raw)
+        if canonical is None:
+            return None
+        if canonical in self._values:
+            self.stats['exact'] += 1
+            return canonical
+        if canonical not in self._resolved:
+            # Only entries with the same house / unit numbers are candidates
+            candidates = self._by_numbers.get(tuple(_NUMBERS.findall(canonical)), [])
+            parts = _street_parts(canonical)
+            matches = [candidate for candidate in candidates if _same_street(parts, _street_parts(candidate))]
+            if len(matches) == 1:
+                logging.info(f"Matched address {raw!r} to {matches[0]!r}")
+            elif matches:
+                logging.warning(f"Address {raw!r} fits {len(matches)} entries ({', '.join(matches)}) - not matched")
+            self._resolved[canonical] = matches[0] if len(matches) == 1 else None
+        match = self._resolved[canonical]
+        self.stats['partial' if match else 'missed'] += 1
+        return match
+
+    def get(self, raw, default=None):
+        match = self.resolve(raw)
+        return self._values[match] if match is not None else default
@@ -0,0 +1,168 @@
+# bench_date_handling.py
+"""
+Micro-benchmark of the per-run date handling
+Compares the old approach - every consumer (current phase, completion %,
+schedule HTML, trade partner email, customer email) calling
+datetime.strptime on each task date - with parsing the dates once at ingest
+through the memoized parser in date_ordinals and working on ordinals.
+
+The "after" timing includes the ingest conversion (Project.from_json) with
+cold caches, so it is the full cost of one run. Both sides must produce the
+same results. Exits with 1 if parse-once is not faster.
+
+Usage: python benchmarks/bench_date_handling.py [projects] [runs]
+"""
+
+import sys
+import time
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import date_ordinals
+from date_ordinals import NO_DATE, today_ordinal
+from schedule_model import Project
+
+TASKS_PER_PROJECT = 120
+TASKS = ['Slab Prep', 'Pour Slab', 'Framing', 'Plumbing', 'ELEC', 'Inspections',
+         'Insulation', 'Drywall', 'Flush', 'PVA', 'Texture', 'Paint', 'LVP', 'Trim']
+PHASES = ['foundation', 'framing', 'plumbing', 'electrical', 'drywall', 'painting', 'flooring']
+
+
+def make_export(count):
+    """Synthetic export: dates spread over ~14 months around today, as in a live schedule"""
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=200)
+    projects = []
+    for number in range(count):
+        offset = rng.randrange(150)
+        schedule = []
+        for index in range(TASKS_PER_PROJECT):
+            offset += rng.choice((0, 1, 1, 2, 3))
+            schedule.append({
+                'date': (start + timedelta(days=offset)).isoformat(),
+                'task': rng.choice(TASKS),
+                'phase': PHASES[index * len(PHASES) // TASKS_PER_PROJECT]
+            })
+        projects.append({
+            'community': 'Canal Landing',
+            'address': f"{4700 + number} W Quinault",
+            'lots': str(number),
+            'sqft': '1850',
+            'schedule': schedule
+        })
+    return projects
+
+
+def run_strptime(projects):
+    """Date handling as every consumer did it before: strptime per task, per consumer"""
+    results = []
+    today = datetime.now().date()
+    for project in projects:
+        schedule = project['schedule']
+
+        # parse_schedule_data: current phase
+        current_phase = 'Planning'
+        for task in schedule:
+            if datetime.strptime(task['date'], '%Y-%m-%d').date() <= today:
+                current_phase = task.get('phase', 'other')
+
+        # _calculate_completion
+        completed = sum(1 for item in schedule
+                        if datetime.strptime(item['date'], '%Y-%m-%d').date() <= today)
+
+        # _generate_schedule_html: status and formatted date
+        html_dates = []
+        for item in schedule:
+            task_date = datetime.strptime(item['date'], '%Y-%m-%d').date()
+            html_dates.append((task_date < today, task_date.strftime('%B %d, %Y')))
+
+        # trade partner email: next three tasks
+        upcoming = [task['date'] for task in schedule
+                    if datetime.strptime(task['date'], '%Y-%m-%d').date() >= datetime.now().date()][:3]
+
+        # customer email: window around today and estimated completion
+        window = []
+        for task in schedule:
+            days_diff = (datetime.strptime(task['date'], '%Y-%m-%d').date() - today).days
+            if -7 <= days_diff <= 14:
+                window.append(days_diff)
+        est_completion = datetime.strptime(max(task['date'] for task in schedule), '%Y-%m-%d')
+
+        results.append((current_phase, completed, html_dates, upcoming, window, est_completion))
+    return results
+
+
+def run_ordinals(exported):
+    """Date handling now: parse once at ingest, consumers compare ordinals"""
+    projects = [Project.from_json(data) for data in exported]
+    results = []
+    today = today_ordinal()
+    for project in projects:
+        schedule = project.schedule
+        dates = schedule.dates
+
+        current_phase = 'Planning'
+        for index, ordinal in enumerate(dates):
+            if ordinal != NO_DATE and ordinal <= today:
+                current_phase = schedule.phase(index)
+
+        completed = sum(1 for ordinal in dates if ordinal != NO_DATE and ordinal <= today)
+
+        html_dates = [(ordinal < today, date.fromordinal(ordinal).strftime('%B %d, %Y')) for ordinal in dates]
+
+        upcoming = [schedule.date_text(index) for index, ordinal in enumerate(dates) if ordinal >= today][:3]
+
+        window = [ordinal - today for ordinal in dates if -7 <= ordinal - today <= 14]
+        est_completion = datetime.fromordinal(schedule.last_date())
+
+        results.append((current_phase, completed, html_dates, upcoming, window, est_completion))
+    return results
+
+
+def clear_caches():
+    date_ordinals._parse.cache_clear()
+    date_ordinals.ordinal_text.cache_clear()
+
+
+def best_of(runs, func, *args, setup=None):
+    timings = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    exported = make_export(count)
+    tasks = count * TASKS_PER_PROJECT
+
+    before, expected = best_of(runs, run_strptime, exported)
+    after, actual = best_of(runs, run_ordinals, exported, setup=clear_caches)
+    if actual != expected:
+        print("FAIL: parse-once results differ from strptime results")
+        return 1
+
+    parse_info = date_ordinals.cache_info()['parse']
+    print(f"{count} projects, {tasks} tasks, {parse_info.misses} distinct dates, best of {runs} runs")
+    print(f"strptime in every consumer:  {before * 1000:8.1f} ms  ({before / tasks * 1e6:.2f} us/task)")
+    print(f"parse once, ordinals:        {after * 1000:8.1f} ms  ({after / tasks * 1e6:.2f} us/task, incl. ingest)")
+    print(f"speedup: {before / after:.1f}x")
+
+    if after >= before:
+        print("FAIL: parse-once is not faster")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
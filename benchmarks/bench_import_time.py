@@ -0,0 +1,77 @@
+# bench_import_time.py
+"""
+Cold-start benchmark for schedule_automation_enhanced
+Imports the module in fresh interpreters and fails (exit code 1) if the
+import takes longer than the budget, pulls in a heavy dependency, or has
+side effects such as configuring logging.
+
+Usage: python benchmarks/bench_import_time.py [runs]
+"""
+
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+MODULE = 'schedule_automation_enhanced'
+
+# Cumulative import time of the module itself (python -X importtime)
+IMPORT_BUDGET_MS = 100
+
+# Must not be loaded until a code path needs them
+HEAVY_MODULES = [
+    'pandas', 'numpy', 'openpyxl', 'pdfplumber', 'googleapiclient',
+    'google.oauth2', 'smtplib', 'email.mime', 'asyncio', 'dotenv'
+]
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CHECK_SCRIPT = f"""
+import sys, json, logging
+import {MODULE}
+print(json.dumps({{
+    'heavy': sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules),
+    'logging_configured': bool(logging.getLogger().handlers),
+}}))
+"""
+
+
+def measure_once():
+    """Cumulative import time of MODULE in microseconds, from a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {MODULE}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    for line in reversed(result.stderr.splitlines()):
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == MODULE:
+            return int(parts[1])
+    raise RuntimeError(f"No importtime entry for {MODULE}")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+
+    timings = sorted(measure_once() / 1000 for _ in range(runs))
+    best, median = timings[0], timings[len(timings) // 2]
+    print(f"import {MODULE}: best {best:.1f} ms, median {median:.1f} ms over {runs} runs "
+          f"(budget {IMPORT_BUDGET_MS} ms)")
+
+    check = subprocess.run(
+        [sys.executable, '-c', CHECK_SCRIPT],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    report = json.loads(check.stdout.strip().splitlines()[-1])
+    print(f"heavy modules loaded at import: {report['heavy'] or 'none'}")
+    print(f"logging configured at import: {report['logging_configured']}")
+
+    failed = median > IMPORT_BUDGET_MS or report['heavy'] or report['logging_configured']
+    if failed:
+        print("FAIL: cold start regression")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
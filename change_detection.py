@@ -0,0 +1,99 @@
+# change_detection.py
+"""
+Content fingerprints for the automation inputs
+Lets a run that sees the same VBA export and workbook as last time skip the
+pipeline entirely (no parsing, no writes, no copies).
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+
+def hash_bytes(data):
+    """Short, fast content hash used for all fingerprints"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class FingerprintStore:
+    """Persistent map of input name -> content hash of the last processed version"""
+
+    def __init__(self, store_path):
+        self.store_path = Path(store_path)
+        self._data = self._load()
+        # path -> ((mtime_ns, size), digest) so large files are only re-read when touched
+        self._stat_cache = {}
+
+    def _load(self):
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable fingerprint store {self.store_path}: {e}")
+            return {}
+
+    def file_digest(self, path, trust_stat=False):
+        """
+        Content hash of a file, None if it does not exist
+
+        Args:
+            path: File to hash
+            trust_stat: Reuse the previous digest while mtime and size are unchanged
+                        (used for the workbook, which is large and rarely touched)
+        """
+        path = Path(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        signature = (st.st_mtime_ns, st.st_size)
+        if trust_stat:
+            cached = self._stat_cache.get(str(path))
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        # Hashed in blocks so large exports/workbooks are never held in memory whole
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        digest = h.hexdigest()
+        self._stat_cache[str(path)] = (signature, digest)
+        return digest
+
+    def fingerprint(self, export_path, *stamps):
+        """
+        Combined fingerprint of the VBA export and the other inputs of a run
+
+        Args:
+            export_path: VBA export (hashed by content)
+            stamps: Version stamps of the other inputs as the run used them,
+                    e.g. the workbook snapshot's (mtime_ns, size)
+        """
+        export_digest = self.file_digest(export_path)
+        stamps_digest = hash_bytes(json.dumps(stamps).encode('utf-8'))
+        return f"{export_digest}:{stamps_digest}"
+
+    def matches(self, key, fingerprint):
+        """True if `fingerprint` equals the one recorded for `key`"""
+        return self._data.get(key) == fingerprint
+
+    def record(self, key, fingerprint):
+        """Remember `fingerprint` for `key` and persist the store"""
+        if self._data.get(key) == fingerprint:
+            return
+        self._data[key] = fingerprint
+
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.store_path.with_name(self.store_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.store_path)
+        except Exception as e:
+            logging.error(f"Failed to save fingerprint store: {e}")
@@ -0,0 +1,92 @@
+# data_shards.py
+"""
+Per-project and per-community shards of the combined dashboard data
+Lets a dashboard that is filtered to one community or address fetch a small
+manifest plus only the shards it shows, instead of the whole combined file.
+
+    manifest.json                        keys, communities, phases, est_finish, hashes,
+                                         project counts per community and phase
+    shards/projects/<key>-<id>.json      {"projects": {key: entry}}
+    shards/communities/<name>-<id>.json  {"community": name, "projects": {...}}
+
+Shard names carry a short hash of the key so unusual characters ('/' in
+duplex addresses) never collide; the content hash in the manifest lets
+clients cache shards until they change.
+"""
+
+import re
+import json
+import hashlib
+
+from change_detection import hash_bytes
+
+SHARD_DIR = 'shards'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def _shard_name(kind, name):
+    slug = re.sub(r'[^A-Za-z0-9.-]+', '_', name).strip('_.') or 'shard'
+    key_id = hashlib.blake2b(name.encode('utf-8'), digest_size=4).hexdigest()
+    return f"{SHARD_DIR}/{kind}/{slug}-{key_id}.json"
+
+
+def _dumps(document):
+    return json.dumps(document, separators=(',', ':')).encode('utf-8')
+
+
+def shard_outputs(document, phase_counts=None):
+    """
+    Shard files and manifest for a combined document (v1 shape)
+
+    Args:
+        document: Combined document (entries carry their precomputed est_finish)
+        phase_counts: {community: {phase: projects}} published as "phaseCounts"
+
+    Returns:
+        dict: file name (relative, '/' separated) -> bytes
+    """
+    outputs = {}
+    project_rows = []
+    communities = {}
+
+    for key, entry in document['projects'].items():
+        name = _shard_name('projects', key)
+        data = _dumps({'projects': {key: entry}})
+        outputs[name] = data
+
+        community = entry.get('community', '')
+        communities.setdefault(community, {})[key] = entry
+        project_rows.append({
+            'key': key,
+            'community': community,
+            'address': entry.get('address', ''),
+            'current_phase': entry.get('current_phase'),
+            'est_finish': entry.get('est_finish'),
+            'shard': name,
+            'hash': hash_bytes(data)
+        })
+
+    community_rows = {}
+    for community, projects in communities.items():
+        name = _shard_name('communities', community)
+        data = _dumps({'community': community, 'projects': projects})
+        outputs[name] = data
+        community_rows[community] = {
+            'count': len(projects),
+            'shard': name,
+            'hash': hash_bytes(data)
+        }
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'lastUpdated': document['lastUpdated'],
+        'summary': document['summary'],
+        'communities': community_rows,
+        'projects': project_rows
+    }
+    if phase_counts is not None:
+        manifest['phaseCounts'] = phase_counts
+    # Last, so publishing writes the manifest only after the shards it lists
+    outputs[MANIFEST_NAME] = _dumps(manifest)
+    return outputs
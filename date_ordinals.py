@@ -0,0 +1,47 @@
+# date_ordinals.py
+"""
+Parse-once handling of the export's task dates
+Task dates arrive as 'YYYY-MM-DD' strings and the same few hundred dates
+repeat across every project, so they are converted to integer day ordinals
+once, through a memoized parser, when a project is ingested. Everything
+downstream (current phase, completion %, emails, schedule HTML, wire format)
+compares and subtracts ordinals; text is only produced again for output.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+# Ordinal stored for a date that is missing or not ISO formatted
+NO_DATE = 0
+
+
+@lru_cache(maxsize=8192)
+def _parse(value):
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        return NO_DATE
+    # fromisoformat also takes forms like '20240102' - keep those as text
+    return parsed.toordinal() if parsed.isoformat() == value else NO_DATE
+
+
+def date_ordinal(value):
+    """Day ordinal of an ISO date string, NO_DATE if it cannot be round-tripped"""
+    if not isinstance(value, str):
+        return NO_DATE
+    return _parse(value)
+
+
+@lru_cache(maxsize=8192)
+def ordinal_text(ordinal):
+    """ISO text of a day ordinal (inverse of date_ordinal)"""
+    return date.fromordinal(ordinal).isoformat()
+
+
+def today_ordinal():
+    return datetime.now().date().toordinal()
+
+
+def cache_info():
+    """Hit / miss counters of the parse and format caches"""
+    return {'parse': _parse.cache_info(), 'format': ordinal_text.cache_info()}
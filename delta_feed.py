@@ -0,0 +1,212 @@
+# delta_feed.py
+"""
+JSON-Patch (RFC 6902) delta feed for the combined dashboard data
+Each published export gets a version number and a patch against the
+previous version, so a client that already holds version N only downloads
+the patches up to the current version instead of the whole document.
+
+    delta/<to>.json       {"from": N, "to": N + 1, "ops": [...]}
+    delta/snapshot.json   {"version": N, "document": {...}}  (full fallback)
+    delta/index.json      {"version": N, "oldest": M, "snapshotBytes": ..., "patchBytes": [...]}
+
+Only the last `max_chain` patches are kept; a client older than "oldest"
+(or one for which the patches would be larger than the snapshot) fetches
+the snapshot instead.
+
+Key order is part of the document: a patched client must end up with the
+projects in the same order as one that loads the snapshot.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+
+DELTA_DIR = 'delta'
+
+
+def _pointer(path, token):
+    return f"{path}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+def _same(a, b):
+    """Equality that also tells 100 from 100.0, 1 from True and differently ordered
+    objects apart (they serialize differently)"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(_same, a, b))
+    return a == b
+
+
+def diff(old, new, path=''):
+    """
+    RFC 6902 operations that turn `old` into `new`
+
+    Objects are compared key by key; for arrays the common head and tail are
+    skipped and the changed middle is patched element by element. Applying
+    the ops removes keys in place and appends added ones, so an object whose
+    key order would come out different is replaced as a whole.
+
+    Returns:
+        list: add / remove / replace operations
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patched_order = [key for key in old if key in new] + [key for key in new if key not in old]
+        if patched_order != list(new):
+            return [{'op': 'replace', 'path': path, 'value': new}]
+
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({'op': 'add', 'path': _pointer(path, key), 'value': value})
+            elif not _same(old[key], value):
+                ops.extend(diff(old[key], value, _pointer(path, key)))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        head = 0
+        limit = min(len(old), len(new))
+        while head < limit and _same(old[head], new[head]):
+            head += 1
+        tail = 0
+        while tail < limit - head and _same(old[-1 - tail], new[-1 - tail]):
+            tail += 1
+
+        old_middle = old[head:len(old) - tail]
+        new_middle = new[head:len(new) - tail]
+        common = min(len(old_middle), len(new_middle))
+
+        ops = []
+        for offset in range(common):
+            ops.extend(diff(old_middle[offset], new_middle[offset], _pointer(path, head + offset)))
+        for offset in range(common, len(new_middle)):
+            ops.append({'op': 'add', 'path': _pointer(path, head + offset), 'value': new_middle[offset]})
+        for _ in range(common, len(old_middle)):
+            ops.append({'op': 'remove', 'path': _pointer(path, head + common)})
+        return ops
+
+    if _same(old, new):
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def apply_patch(document, ops):
+    """Apply add / remove / replace operations (in place where possible)"""
+    for op in ops:
+        tokens = [token.replace('~1', '/').replace('~0', '~') for token in op['path'].split('/')[1:]]
+        if not tokens:
+            document = op['value']
+            continue
+
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+
+        if isinstance(parent, list):
+            index = len(parent) if last == '-' else int(last)
+            if op['op'] == 'add':
+                parent.insert(index, op['value'])
+            elif op['op'] == 'remove':
+                del parent[index]
+            else:
+                parent[index] = op['value']
+        else:
+            if op['op'] == 'remove':
+                del parent[last]
+            else:
+                parent[last] = op['value']
+    return document
+
+
+def _dumps(document):
+    return json.dumps(document, separators=(',', ':')).encode('utf-8')
+
+
+class DeltaFeed:
+    """Versioned patch chain, persisted between runs"""
+
+    def __init__(self, state_path, max_chain=20):
+        """
+        Args:
+            state_path: JSON file holding the current version, the last
+                        published document and the retained patches
+            max_chain: Number of patches kept for clients to catch up with
+        """
+        self.state_path = Path(state_path)
+        self.max_chain = max_chain
+        self.version = 0
+        self.document = None
+        self.patches = []   # [(to_version, ops)], oldest first
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"Starting a new delta feed, state unreadable ({self.state_path}): {e}")
+            return
+        self.version = state['version']
+        self.document = state['document']
+        self.patches = [(to_version, ops) for to_version, ops in state['patches']]
+
+    def _save(self):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'document': self.document, 'patches': self.patches}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logging.error(f"Failed to save delta feed state: {e}")
+
+    def update(self, document):
+        """
+        Record a newly published document
+
+        Returns:
+            int: The current version (unchanged if the document is identical)
+        """
+        if self.document is None:
+            self.version += 1
+            self.patches = []
+        else:
+            ops = diff(self.document, document)
+            if not ops:
+                return self.version
+            self.version += 1
+            self.patches.append((self.version, ops))
+            self.patches = self.patches[-self.max_chain:]
+
+        # Keep a private copy - the caller's document may be mutated later
+        self.document = json.loads(json.dumps(document))
+        self._save()
+        return self.version
+
+    def outputs(self):
+        """Feed files (name -> bytes) for publishing; the index comes last"""
+        outputs = {}
+        patch_bytes = []
+        for to_version, ops in self.patches:
+            data = _dumps({'from': to_version - 1, 'to': to_version, 'ops': ops})
+            outputs[f"{DELTA_DIR}/{to_version}.json"] = data
+            patch_bytes.append(len(data))
+
+        snapshot = _dumps({'version': self.version, 'document': self.document})
+        outputs[f"{DELTA_DIR}/snapshot.json"] = snapshot
+        outputs[f"{DELTA_DIR}/index.json"] = _dumps({
+            'version': self.version,
+            'oldest': self.version - len(self.patches),
+            'snapshotBytes': len(snapshot),
+            'patchBytes': patch_bytes
+        })
+        return outputs
@@ -0,0 +1,113 @@
+# export_reader.py
+"""
+Streaming reader for the VBA schedule export
+Yields the entries of the top-level "projects" array one at a time, reading
+the file in chunks, so memory use depends on the largest single project
+rather than on the size of the whole export.
+"""
+
+import re
+import json
+
+_WHITESPACE = ' \t\r\n'
+_NUMBER_START = '-0123456789'
+_NUMBER_END = re.compile(r'[\s,\]}]')
+
+
+class _ChunkedText:
+    """Text buffer over a file that grows on demand and discards consumed text"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk; returns False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > len(self.buf) // 2:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), '' at end of file"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def decode(self, decoder):
+        """Decode the next complete JSON value, reading more text as needed"""
+        first = self.peek()
+        if first and first in _NUMBER_START:
+            # A bare number can be cut anywhere by a chunk boundary ("1" + ".5"),
+            # so make sure its terminator has been read first
+            while not _NUMBER_END.search(self.buf, self.pos) and self.fill():
+                pass
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+
+def iter_export_projects(json_path, chunk_size=64 * 1024, key='projects'):
+    """
+    Yield each project dict of the export's top-level `key` array
+
+    Other top-level members (export_date, ...) are decoded and skipped.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        text = _ChunkedText(f, chunk_size)
+        text.expect('{')
+        if text.peek() == '}':
+            return
+
+        while True:
+            name = text.decode(decoder)
+            text.expect(':')
+
+            if name == key:
+                text.expect('[')
+                if text.peek() == ']':
+                    text.pos += 1
+                else:
+                    while True:
+                        yield text.decode(decoder)
+                        if text.peek() == ',':
+                            text.pos += 1
+                            continue
+                        text.expect(']')
+                        break
+            else:
+                text.decode(decoder)
+
+            if text.peek() == ',':
+                text.pos += 1
+                continue
+            text.expect('}')
+            return
@@ -0,0 +1,117 @@
+# lot_pairs.py
+"""
+Duplex lot-pair registry
+The pairs and single lots of each community, with their addresses, live in
+lot_pairs.json:
+
+    {
+      "Canal Landing": {
+        "pairs": [{"lots": [1, 2], "addresses": ["1160 N Yost St", "1156 N Yost St"]}, ...],
+        "singles": [{"lot": 19, "address": "4816 N Yost St"}, ...]
+      }
+    }
+
+The file is indexed once into a (community, lot) -> record table (community
+names compared by their canonical key, see address_keys) and only
+read again when its modification time changes, so new lots can be added
+without touching the code and pairing a run costs one lookup per project.
+The file's stamp is part of the automation's input fingerprint, so an edit
+is published by the next run even if the export did not change.
+"""
+
+import os
+import re
+import json
+import logging
+from pathlib import Path
+
+from address_keys import community_key
+
+DEFAULT_PATH = Path(__file__).resolve().parent / "lot_pairs.json"
+
+_LOT_NUMBER = re.compile(r'\d+')
+
+
+def lot_number(lots):
+    """First number of a 'lots' field ('Lot 81', '81', 'Lots 11'), None if there is none"""
+    match = _LOT_NUMBER.search(lots or '')
+    return int(match.group()) if match else None
+
+
+class LotRecord:
+    """One pair or single lot of a community"""
+
+    __slots__ = ('order', 'community', 'lots', 'addresses', 'info')
+
+    def __init__(self, order, community, lots, addresses, info):
+        self.order = order          # position in the file (output order)
+        self.community = community
+        self.lots = lots            # (lot1, lot2) for a pair, (lot,) for a single
+        self.addresses = addresses
+        self.info = info            # the entry as written in the file
+
+    @property
+    def is_pair(self):
+        return len(self.lots) == 2
+
+
+class LotPairRegistry:
+    """Indexed view of lot_pairs.json, reloaded when the file changes"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self.records = []
+        self._index = {}
+        self._stamp = None
+
+    def _build(self, config):
+        records = []
+        index = {}
+        for community, entries in config.items():
+            for pair in entries.get('pairs', []):
+                records.append(LotRecord(len(records), community, tuple(pair['lots']), tuple(pair['addresses']), pair))
+            for single in entries.get('singles', []):
+                records.append(LotRecord(len(records), community, (single['lot'],), (single['address'],), single))
+
+        for record in records:
+            for lot in record.lots:
+                key = (community_key(record.community), lot)
+                if key in index:
+                    logging.warning(f"Lot {lot} of {record.community} is listed twice in {self.path.name}; using the first entry")
+                    continue
+                index[key] = record
+        return records, index
+
+    @property
+    def stamp(self):
+        """(mtime_ns, size) of the file version last read, 'missing' if there is none"""
+        return self._stamp
+
+    def refresh(self):
+        """Reload the file if its modification time (or size) changed"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._stamp != 'missing':
+                logging.warning(f"Lot pair file not found: {self.path}")
+                self._stamp = 'missing'
+            return self
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return self
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            self.records, self._index = self._build(config)
+            logging.info(f"Loaded {len(self.records)} lot pairs/singles from {self.path.name}")
+        except Exception as e:
+            # Keep pairing with the previous table until the file is fixed
+            logging.error(f"Invalid lot pair file {self.path}: {e}")
+        self._stamp = stamp
+        return self
+
+    def lookup(self, community, lot):
+        """Record of a lot (pair or single), None if the lot is not listed"""
+        return self._index.get((community_key(community), lot))
@@ -0,0 +1,107 @@
+# output_variants.py
+"""
+Minified and pre-compressed variants of the dashboard JSON files
+Next to schedule_data.json the writer emits schedule_data.min.json,
+schedule_data.min.json.gz and schedule_data.min.json.br. The document is
+serialized once; both compressed files are made from those same bytes.
+Brotli is optional - without the package the .br variant is not written.
+"""
+
+import os
+import gzip
+import json
+import logging
+from pathlib import Path
+
+# Suffix -> Content-Encoding a web server would send it with
+VARIANTS = {
+    '.min.json': None,
+    '.min.json.gz': 'gzip',
+    '.min.json.br': 'br',
+}
+
+
+def variant_path(json_path, suffix):
+    """schedule_data.json + '.min.json.gz' -> schedule_data.min.json.gz"""
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + suffix)
+
+
+def encode_variants(document):
+    """
+    Serialize `document` once and compress the result
+
+    Returns:
+        dict: suffix -> bytes, for every variant that can be produced here
+    """
+    minified = json.dumps(document, separators=(',', ':')).encode('utf-8')
+    variants = {
+        '.min.json': minified,
+        # mtime=0 keeps the bytes identical for identical documents
+        '.min.json.gz': gzip.compress(minified, compresslevel=9, mtime=0),
+    }
+
+    try:
+        import brotli
+    except ImportError:
+        logging.debug("brotli not installed - skipping .br variant")
+    else:
+        variants['.min.json.br'] = brotli.compress(minified, mode=brotli.MODE_TEXT, quality=11)
+
+    return variants
+
+
+def variant_outputs(json_name, document):
+    """
+    Variant files for the JSON file `json_name`
+
+    Returns:
+        dict: file name -> bytes; None for a variant that cannot be produced
+              here, so a stale copy of it is removed when publishing
+    """
+    variants = encode_variants(document)
+    return {
+        variant_path(json_name, suffix).name: variants.get(suffix)
+        for suffix in VARIANTS
+    }
+
+
+def smallest_variant(json_path, encodings=()):
+    """
+    Smallest existing file a sink can serve for `json_path`
+
+    Args:
+        json_path: The pretty-printed JSON file
+        encodings: Content-Encodings the sink can serve ('gzip', 'br');
+                   empty for sinks that only serve plain files
+
+    Returns:
+        tuple: (path, content_encoding or None)
+    """
+    json_path = Path(json_path)
+    candidates = [(json_path, None)] + [
+        (variant_path(json_path, suffix), encoding)
+        for suffix, encoding in VARIANTS.items()
+        if encoding is None or encoding in encodings
+    ]
+
+    try:
+        source_mtime = os.stat(json_path).st_mtime_ns
+    except OSError:
+        source_mtime = 0
+
+    best = None
+    for path, encoding in candidates:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        # A variant older than the JSON it belongs to is left over from another writer
+        if st.st_mtime_ns < source_mtime:
+            continue
+        if best is None or st.st_size < best[0]:
+            best = (st.st_size, path, encoding)
+
+    if best is None:
+        return json_path, None
+    return best[1], best[2]
@@ -0,0 +1,160 @@
+# output_writer.py
+"""
+Atomic writer for the published dashboard files
+Every file is serialized once in memory and written to each destination via
+a temp file + fsync + rename, so dashboards and sync clients never see a
+half-written file. Destinations that already hold the same bytes are left
+untouched (no needless Dropbox / Drive re-uploads), and a destination on the
+same filesystem as an already written copy gets a hardlink instead of
+another write.
+"""
+
+import os
+import logging
+from pathlib import Path
+
+
+def _temp_path(path):
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def _fsync_dir(directory):
+    # Makes the rename itself durable; directories cannot be opened on Windows
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _has_content(path, data):
+    """True if `path` exists and holds exactly `data`"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def write_atomic(path, data):
+    """Replace `path` with `data` (bytes) in one rename"""
+    path = Path(path)
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def _link_atomic(source, path):
+    """Replace `path` with a hardlink to `source`; False if linking is not possible"""
+    tmp_path = _temp_path(path)
+    try:
+        os.link(source, tmp_path)
+    except (OSError, NotImplementedError):
+        return False
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    _fsync_dir(path.parent)
+    return True
+
+
+def publish_file(path, data, source=None):
+    """
+    Make `path` hold `data`
+
+    Args:
+        path: Destination file
+        data: File content (bytes), None to remove the file
+        source: A file already known to hold `data` (hardlinked when it is on
+                the same filesystem)
+
+    Returns:
+        str: 'unchanged', 'linked', 'written' or 'removed'
+    """
+    path = Path(path)
+
+    if data is None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return 'unchanged'
+        return 'removed'
+
+    if source is not None:
+        try:
+            if os.path.samefile(source, path):
+                return 'unchanged'
+        except OSError:
+            pass
+
+    if _has_content(path, data):
+        return 'unchanged'
+
+    if source is not None:
+        try:
+            st = os.stat(source)
+            same_device = st.st_dev == os.stat(path.parent).st_dev and st.st_size == len(data)
+        except OSError:
+            same_device = False
+        if same_device and _link_atomic(source, path):
+            return 'linked'
+
+    write_atomic(path, data)
+    return 'written'
+
+
+def publish_files(outputs, directory, source_dir=None, prune=()):
+    """
+    Publish a set of files into one directory
+
+    Args:
+        outputs: Ordered dict of file name -> bytes (None removes the file);
+                 names may contain '/' for files in subfolders
+        directory: Destination folder (created if needed)
+        source_dir: Folder that already holds the same outputs (hardlink source)
+        prune: Subfolders whose files not listed in outputs are removed
+
+    Returns:
+        dict: Result of publish_file per file name
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    for name, data in outputs.items():
+        path = directory / name
+        if data is not None and path.parent != directory:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        source = Path(source_dir) / name if source_dir is not None and data is not None else None
+        results[name] = publish_file(path, data, source)
+
+    keep = {directory / name for name in outputs}
+    for subdir in prune:
+        for path in (directory / subdir).rglob('*'):
+            if path.is_file() and path not in keep:
+                os.remove(path)
+                results[path.relative_to(directory).as_posix()] = 'removed'
+
+    changed = sum(1 for result in results.values() if result != 'unchanged')
+    logging.debug(f"Published {changed}/{len(results)} files to {directory}")
+    return results
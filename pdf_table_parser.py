@@ -1,14 +1,59 @@
 # pdf_table_parser.py
+import os
 import pdfplumber
 import pandas as pd
 from pathlib import Path
 import re
 from datetime import datetime
 import json
+from task_categories import categorize_task, cache_info as categorizer_stats
+
+# PDF opened once per worker process (see _init_page_worker)
+_worker_pdf = None
+
+
+def _init_page_worker(pdf_path):
+    global _worker_pdf
+    _worker_pdf = pdfplumber.open(pdf_path)
+
+
+def _worker_page_rows(page_index):
+    return continuation_page_rows(_worker_pdf.pages[page_index])
+
+
+def continuation_page_rows(page):
+    """
+    Schedule cells of a continuation page as plain (column_index, date, task)
+    tuples, in reading order (row by row, left to right)
+    
+    Only needs the page itself, so pages can be analyzed in worker processes;
+    the column layout from page 1 is applied when the tuples are merged.
+    """
+    rows = []
+    for table in page.extract_tables():
+        for row in table:
+            if row[0]:  # Check first column for date
+                date_match = re.search(r'(\d{1,2}-\w{3})', str(row[0]))
+                if date_match:
+                    date_obj = ScheduleTableParser._parse_date(date_match.group(1))
+                    
+                    if date_obj:
+                        date_text = date_obj.strftime('%Y-%m-%d')
+                        for col_idx, task in enumerate(row[1:]):
+                            if task and str(task).strip():
+                                rows.append((col_idx, date_text, str(task)))
+    return rows
+
 
 class ScheduleTableParser:
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, workers=1):
+        """
+        Args:
+            pdf_path: Master Schedule PDF
+            workers: Processes for the continuation pages (1 = parse in this process)
+        """
         self.pdf_path = Path(pdf_path)
+        self.workers = workers
         self.projects = []
         self.debug = True
         self.column_positions = []
@@ -16,11 +61,27 @@ class ScheduleTableParser:
     def parse(self):
         """Parse the entire PDF and return structured project data"""
         with pdfplumber.open(self.pdf_path) as pdf:
-            if len(pdf.pages) > 0:
+            page_count = len(pdf.pages)
+            if page_count > 0:
                 self._parse_first_page(pdf.pages[0])
             
-            for page_num, page in enumerate(pdf.pages[1:], start=2):
-                self._parse_continuation_page(page, page_num)
+            if self.workers > 1 and page_count > 2:
+                # Layout analysis is CPU-bound: fan the continuation pages out,
+                # then merge in page order so the result matches a serial parse
+                from concurrent.futures import ProcessPoolExecutor
+                
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, page_count - 1),
+                    initializer=_init_page_worker,
+                    initargs=(str(self.pdf_path),)
+                ) as pool:
+                    page_rows = pool.map(_worker_page_rows, range(1, page_count))
+                    for page_num, rows in enumerate(page_rows, start=2):
+                        print(f"Parsing page {page_num}...")
+                        self._merge_page_rows(rows)
+            else:
+                for page_num, page in enumerate(pdf.pages[1:], start=2):
+                    self._parse_continuation_page(page, page_num)
                 
         return self.projects
     
@@ -318,33 +379,25 @@ class ScheduleTableParser:
     def _parse_continuation_page(self, page, page_num):
         """Parse continuation pages"""
         print(f"Parsing page {page_num}...")
-        
-        # Try table extraction first
-        tables = page.extract_tables()
-        
-        if tables:
-            for table in tables:
-                for row in table:
-                    if row[0]:  # Check first column for date
-                        date_match = re.search(r'(\d{1,2}-\w{3})', str(row[0]))
-                        if date_match:
-                            date_str = date_match.group(1)
-                            date_obj = self._parse_date(date_str)
-                            
-                            if date_obj:
-                                # Add tasks to corresponding projects
-                                for col_idx, task in enumerate(row[1:]):
-                                    if task and str(task).strip():
-                                        # Find projects with this column index
-                                        for project in self.projects:
-                                            if project['column_index'] == col_idx:
-                                                project['schedule'].append({
-                                                    'date': date_obj.strftime('%Y-%m-%d'),
-                                                    'task': str(task).strip(),
-                                                    'phase': self._categorize_task(str(task))
-                                                })
+        self._merge_page_rows(continuation_page_rows(page))
     
-    def _parse_date(self, date_str):
+    def _merge_page_rows(self, rows):
+        """Add a continuation page's (column_index, date, task) tuples to the projects"""
+        by_column = {}
+        for project in self.projects:
+            by_column.setdefault(project['column_index'], []).append(project)
+        
+        for col_idx, date_text, task in rows:
+            # Add tasks to corresponding projects
+            for project in by_column.get(col_idx, ()):
+                project['schedule'].append({
+                    'date': date_text,
+                    'task': task.strip(),
+                    'phase': self._categorize_task(task)
+                })
+    
+    @staticmethod
+    def _parse_date(date_str):
         """Parse date string to datetime object"""
         try:
             return datetime.strptime(f"{date_str}-2024", "%d-%b-%Y")
@@ -352,31 +405,8 @@ class ScheduleTableParser:
             return None
     
     def _categorize_task(self, task):
-        """Categorize task into construction phase"""
-        task_lower = task.lower()
-        
-        phase_keywords = {
-            'foundation': ['foundation', 'concrete', 'slab', 'footing', 'foundy', 'pour slab', 'pour foundy'],
-            'framing': ['frame', 'framing', 'lumber', 'walls', 'nailing'],
-            'roofing': ['roof', 'shingle', 'roofing'],
-            'electrical': ['electrical', 'elec', 'wire', 'electric'],
-            'plumbing': ['plumb', 'pipe', 'water', 'finish plumbing'],
-            'hvac': ['hvac', 'heat', 'air', 'duct'],
-            'insulation': ['insulation', 'insulate'],
-            'drywall': ['drywall', 'sheetrock', 'hang', 'tape', 'texture', 'double', 'flush', 'pva'],
-            'flooring': ['floor', 'lvp', 'carpet', 'tile'],
-            'painting': ['paint', 'primer'],
-            'cabinets': ['cabinet', 'c-tops', 'b-splsh', 'countertop', 'cabinet install'],
-            'finishing': ['finish', 'trim', 'detail', 'cleaning'],
-            'inspection': ['inspection', 'final inspection', 'insp'],
-            'move': ['move', 'clean/move']
-        }
-        
-        for phase, keywords in phase_keywords.items():
-            if any(keyword in task_lower for keyword in keywords):
-                return phase
-        
-        return 'other'
+        """Categorize task into construction phase (shared table, see task_categories.py)"""
+        return categorize_task(task)
     
     def save_parsed_data(self, output_path):
         """Save parsed data to JSON"""
@@ -397,6 +427,10 @@ class ScheduleTableParser:
             for proj in projs:
                 print(f"  - {proj['address']} (Lot {proj['lots']}): {len(proj['schedule'])} schedule items")
         
+        if self.debug:
+            stats = categorizer_stats()
+            print(f"\nTask categorizer: {stats.hits} cached / {stats.misses} matched task names")
+        
         with open(output_path, 'w') as f:
             json.dump({
                 'projects': self.projects,
@@ -413,7 +447,7 @@ class ScheduleTableParser:
 if __name__ == "__main__":
     pdf_path = r"G:\My Drive\Project Dashboard\Public\Master Schedule\Master Schedule.pdf"
     
-    parser = ScheduleTableParser(pdf_path)
+    parser = ScheduleTableParser(pdf_path, workers=os.cpu_count() or 1)
     projects = parser.parse()
     
     print(f"\nFound {len(projects)} projects:")
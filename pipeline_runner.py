@@ -0,0 +1,147 @@
+# pipeline_runner.py
+"""
+Staged asyncio pipeline
+Named stages connected by bounded queues. Each stage runs its function in
+worker threads; a stage with several workers handles that many items at
+once (blocking I/O such as SMTP, file copies, uploads), and stages overlap
+only as far as their items stream: a stage that needs all of its input
+(collect=True, or one item holding everything) waits for upstream to finish.
+Full queues push back on upstream stages.
+"""
+
+import time
+import asyncio
+import logging
+
+_DONE = object()
+
+
+class Stage:
+    """One step of the pipeline"""
+
+    def __init__(self, name, func, workers=1, fan_out=False, collect=False):
+        """
+        Args:
+            name: Stage name used in logs and stats
+            func: Called with each item; the return value is passed downstream
+                  (None drops the item)
+            workers: Maximum number of items this stage processes concurrently
+            fan_out: func returns an iterable; every element is sent downstream
+                     as soon as it is produced
+            collect: Wait for upstream to finish and call func once with the
+                     list of all items (for aggregate steps)
+        """
+        self.name = name
+        self.func = func
+        self.workers = 1 if collect else max(1, workers)
+        self.fan_out = fan_out
+        self.collect = collect
+
+
+class PipelineRunner:
+    """Runs items through a list of stages"""
+
+    def __init__(self, stages, queue_size=16):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats = {}
+
+    def run(self, items):
+        """
+        Blocking entry point - returns the items that left the last stage
+
+        A failing item is logged and counted, not raised; check `errors`
+        afterwards to tell a clean run from a partial one.
+        """
+        return asyncio.run(self.run_async(items))
+
+    @property
+    def errors(self):
+        """Number of items that failed in any stage of the last run"""
+        return sum(stats['errors'] for stats in self.stats.values())
+
+    async def run_async(self, items):
+        self.stats = {stage.name: {'items': 0, 'busy': 0.0, 'errors': 0} for stage in self.stages}
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        results = []
+
+        tasks = []
+        for index, stage in enumerate(self.stages):
+            inbox, outbox = queues[index], queues[index + 1]
+            downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            workers = [asyncio.create_task(self._worker(stage, inbox, outbox)) for _ in range(stage.workers)]
+            tasks.append(asyncio.create_task(self._close_after(workers, outbox, downstream)))
+
+        async def drain():
+            while True:
+                item = await queues[-1].get()
+                if item is _DONE:
+                    return
+                results.append(item)
+
+        drainer = asyncio.create_task(drain())
+
+        started = time.perf_counter()
+        for item in items:
+            await queues[0].put(item)
+        for _ in range(self.stages[0].workers if self.stages else 1):
+            await queues[0].put(_DONE)
+
+        await asyncio.gather(*tasks)
+        await drainer
+
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(
+            f"{name}: {s['items']} items/{s['busy']:.3f}s" + (f"/{s['errors']} errors" if s['errors'] else '')
+            for name, s in self.stats.items()
+        )
+        logging.info(f"Pipeline finished in {elapsed:.3f}s ({summary})")
+        return results
+
+    async def _close_after(self, workers, outbox, downstream):
+        """Signal the next stage once every worker of this stage has finished"""
+        await asyncio.gather(*workers)
+        for _ in range(downstream):
+            await outbox.put(_DONE)
+
+    async def _worker(self, stage, inbox, outbox):
+        stats = self.stats[stage.name]
+        collected = []
+
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            if stage.collect:
+                collected.append(item)
+                continue
+            await self._process(stage, stats, item, outbox)
+
+        if stage.collect:
+            await self._process(stage, stats, collected, outbox)
+
+    async def _process(self, stage, stats, item, outbox):
+        started = time.perf_counter()
+        try:
+            if stage.fan_out:
+                iterator = iter(await asyncio.to_thread(stage.func, item))
+                while True:
+                    result = await asyncio.to_thread(next, iterator, _DONE)
+                    if result is _DONE:
+                        break
+                    if result is not None:
+                        stats['busy'] += time.perf_counter() - started
+                        await outbox.put(result)
+                        started = time.perf_counter()
+            else:
+                result = await asyncio.to_thread(stage.func, item)
+                if result is not None:
+                    stats['busy'] += time.perf_counter() - started
+                    await outbox.put(result)
+                    started = time.perf_counter()
+            stats['items'] += 1
+        except Exception as e:
+            stats['errors'] += 1
+            logging.error(f"Pipeline stage '{stage.name}' failed: {e}")
+        finally:
+            stats['busy'] += time.perf_counter() - started
@@ -9,6 +9,7 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 import logging
+from trigger_queue import TriggerQueue
 
 # Set up logging
 logging.basicConfig(
@@ -32,6 +33,11 @@ class MasterScheduleAutomation:
         # Initialize Google Drive service
         self.drive_service = self._init_google_drive()
         
+        # Durable trigger queue - quick successive exports are merged into one run
+        self.trigger_queue = TriggerQueue(os.path.join(self.base_path, "Schedule System", "Automation", "state", "trigger_queue.db"))
+        self.trigger_settle_seconds = 5     # wait for an export burst to finish
+        self.trigger_max_wait_seconds = 60  # ...but never longer than this
+        
         logging.info("Master Schedule Automation initialized")
     
     def _init_google_drive(self):
@@ -57,29 +63,31 @@ class MasterScheduleAutomation:
             return None
     
     def check_trigger_file(self):
-        """Check if Excel has triggered the automation"""
+        """Check if Excel has triggered the automation
+        
+        Queues a new trigger file, then claims the next (coalesced) batch of
+        triggers once the export burst has settled. This is a one-shot run,
+        so it waits out the settle window (picking up any further trigger
+        files meanwhile) instead of leaving a fresh trigger in the queue.
+        """
         trigger_file = os.path.join(self.temp_path, "trigger.txt")
         
-        if os.path.exists(trigger_file):
-            logging.info("Trigger file found - processing...")
-            
-            # Read trigger file
-            with open(trigger_file, 'r') as f:
-                lines = f.readlines()
-            
-            # Parse trigger data
-            trigger_data = {}
-            for line in lines:
-                if ':' in line:
-                    key, value = line.strip().split(':', 1)
-                    trigger_data[key] = value
+        while True:
+            if self.trigger_queue.ingest_file(trigger_file):
+                logging.info("Trigger file found - queued")
             
-            # Delete trigger file
-            os.remove(trigger_file)
-            
-            return trigger_data
+            remaining = self.trigger_queue.settle_remaining(
+                settle=self.trigger_settle_seconds,
+                max_wait=self.trigger_max_wait_seconds
+            )
+            if not remaining:
+                break
+            time.sleep(min(remaining, 1.0))
         
-        return None
+        return self.trigger_queue.claim(
+            settle=self.trigger_settle_seconds,
+            max_wait=self.trigger_max_wait_seconds
+        )
     
     def parse_pdf_schedule(self):
         """Parse the PDF schedule and extract project data"""
@@ -203,11 +211,13 @@ class MasterScheduleAutomation:
         logging.info("Starting Master Schedule Automation")
         
         # Check for trigger
-        trigger_data = self.check_trigger_file()
-        if not trigger_data:
+        batch = self.check_trigger_file()
+        if not batch:
             logging.info("No trigger file found - waiting...")
             return
         
+        trigger_data = batch.data
+        
         # Process the schedule
         try:
             # Parse schedule data
@@ -226,9 +236,12 @@ class MasterScheduleAutomation:
             # Send notifications
             self.send_notifications(trigger_data, projects)
             
+            self.trigger_queue.complete(batch)
             logging.info("Automation completed successfully!")
             
         except Exception as e:
+            # Leave the triggers queued so the next run retries them
+            self.trigger_queue.release(batch)
             logging.error(f"Automation failed: {e}")
 
 def main():
@@ -10,190 +10,253 @@ import time
 import shutil
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
-import openpyxl
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-import pdfplumber
-import re
-from datetime import timedelta
+from datetime import date, timedelta
+from functools import partial
+from trigger_watcher import TriggerWatcher
+from change_detection import FingerprintStore
+from web_data_cache import ProjectEntryCache, project_digest
+from trigger_queue import TriggerQueue, wants_email
+from export_reader import iter_export_projects
+from wire_format import encode_combined
+from output_variants import variant_outputs
+from output_writer import publish_files
+from data_shards import shard_outputs, SHARD_DIR
+from delta_feed import DeltaFeed, DELTA_DIR
+from schedule_model import Project, TASKS, PHASES, compact_tables
+from date_ordinals import NO_DATE, ordinal_text, today_ordinal
+from schedule_rollups import compute_rollups
+from schedule_index import ScheduleIndex
+from task_categories import categorize_task
+from address_keys import AddressIndex, community_key
+from lot_pairs import LotPairRegistry, lot_number, DEFAULT_PATH as DEFAULT_LOT_PAIRS
+from workbook_loader import WorkbookLoader, WorkbookSnapshot, WorkbookReloader
+from workbook_grid import iter_grid_projects
+
+# Heavy dependencies (pandas/openpyxl, Google API client, smtplib, asyncio)
+# are imported inside the code paths that use them, and importing this module
+# has no side effects, so one-shot runs that find nothing to do start fast.
 
 # Test mode - set to True for local testing without Google Drive
 TEST_MODE = True
 
-# Configuration
-from dotenv import load_dotenv
-load_dotenv()
-
+# Configuration - environment values are filled in by init()
 CONFIG = {
     'BASE_PATH': r"G:\My Drive\Project Dashboard",
-    'GMAIL_USER': os.getenv('GMAIL_USER'),
-    'GMAIL_APP_PASSWORD': os.getenv('GMAIL_APP_PASSWORD'),
-    'DRIVE_FOLDER_ID': os.getenv('DRIVE_FOLDER_ID')
+    'GMAIL_USER': None,
+    'GMAIL_APP_PASSWORD': None,
+    'DRIVE_FOLDER_ID': None,
+    # Concurrent copies / SMTP sends in the publish stage
+    'PUBLISH_WORKERS': 4,
+    # Wire format of schedule_data_combined.json: 1 = indented JSON,
+    # 2 = compact columnar (see wire_format.py; the dashboards read both)
+    'COMBINED_FORMAT': 1,
+    # Days of upcoming work listed per trade in the trade partner email
+    'TRADE_LOOKAHEAD_DAYS': 14,
+    # Lot pair registry (None = lot_pairs.json next to this script)
+    'LOT_PAIRS_FILE': None,
+    # Seconds between workbook change checks of the monitoring loop (0 = never reload)
+    'WORKBOOK_RELOAD_SECONDS': 30,
+    # Where runs read the schedule: 'export' = the VBA JSON export,
+    # 'workbook' = the grid of Master Schedule.xlsm (see workbook_grid.py)
+    'SCHEDULE_SOURCE': 'export',
+    # Sheet (None = active sheet) and range the macro exports, for SCHEDULE_SOURCE = 'workbook'
+    'GRID_SHEET': None,
+    'GRID_RANGE': 'D2',
+    # Re-render at least this often in the monitoring loop (0 = only when the date changes)
+    'REFRESH_SECONDS': 0,
+    # Send the trade partner / customer emails a trigger file asks for (opt-in)
+    'SEND_EMAILS': False,
+    # A burst of exports becomes one run: wait until the newest trigger is this
+    # many seconds old, but no longer than the max wait after the oldest one
+    'TRIGGER_SETTLE_SECONDS': 5,
+    'TRIGGER_MAX_WAIT_SECONDS': 60
 }
 
-# Set up logging
-log_dir = os.path.join(CONFIG['BASE_PATH'], "Schedule System", "Automation", "logs")
-os.makedirs(log_dir, exist_ok=True)
+_initialized = False
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(log_dir, f'automation_{datetime.now().strftime("%Y%m%d")}.log')),
-        logging.StreamHandler()
-    ]
-)
+
+def init():
+    """Load .env settings and set up the log directory and logging (idempotent)"""
+    global _initialized
+    if _initialized:
+        return
+    _initialized = True
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    CONFIG.update({
+        'GMAIL_USER': os.getenv('GMAIL_USER'),
+        'GMAIL_APP_PASSWORD': os.getenv('GMAIL_APP_PASSWORD'),
+        'DRIVE_FOLDER_ID': os.getenv('DRIVE_FOLDER_ID'),
+        'PUBLISH_WORKERS': int(os.getenv('PUBLISH_WORKERS', '4')),
+        'COMBINED_FORMAT': int(os.getenv('COMBINED_FORMAT', '1')),
+        'TRADE_LOOKAHEAD_DAYS': int(os.getenv('TRADE_LOOKAHEAD_DAYS', '14')),
+        'LOT_PAIRS_FILE': os.getenv('LOT_PAIRS_FILE'),
+        'WORKBOOK_RELOAD_SECONDS': float(os.getenv('WORKBOOK_RELOAD_SECONDS', '30')),
+        'SCHEDULE_SOURCE': os.getenv('SCHEDULE_SOURCE', 'export'),
+        'GRID_SHEET': os.getenv('GRID_SHEET'),
+        'GRID_RANGE': os.getenv('GRID_RANGE', 'D2'),
+        'REFRESH_SECONDS': float(os.getenv('REFRESH_SECONDS', '0')),
+        'SEND_EMAILS': os.getenv('SEND_EMAILS', '').lower() in ('1', 'true', 'yes'),
+        'TRIGGER_SETTLE_SECONDS': float(os.getenv('TRIGGER_SETTLE_SECONDS', '5')),
+        'TRIGGER_MAX_WAIT_SECONDS': float(os.getenv('TRIGGER_MAX_WAIT_SECONDS', '60'))
+    })
+    
+    # Set up logging
+    log_dir = os.path.join(CONFIG['BASE_PATH'], "Schedule System", "Automation", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(log_dir, f'automation_{datetime.now().strftime("%Y%m%d")}.log')),
+            logging.StreamHandler()
+        ]
+    )
 
 class EnhancedScheduleAutomation:
-    def __init__(self):
-        """Initialize the enhanced automation system"""
+    def __init__(self, customer_data=None, partner_data=None):
+        """Initialize the enhanced automation system
+        
+        Args:
+            customer_data: Preloaded customer lookup (skips reading the workbook)
+            partner_data: Preloaded partner list (skips reading the workbook)
+        """
+        init()
+        
         self.base_path = Path(CONFIG['BASE_PATH'])
         self.temp_path = self.base_path / "Schedule System" / "Temp"
         self.public_path = self.base_path / "Public" / "Master Schedule"
         self.projects_path = self.base_path / "Projects" / "Active"
         self.portals_path = self.base_path / "Customer Portals"
         self.master_files_path = self.base_path / "Schedule System" / "Master Files"
+        self.state_path = self.base_path / "Schedule System" / "Automation" / "state"
+        
+        # Fingerprints of the last processed export/workbook and run counters
+        self.fingerprints = FingerprintStore(self.state_path / "fingerprints.json")
+        self.metrics = {'runs': 0, 'skipped_unchanged': 0}
+        
+        # Durable queue of trigger.txt events, opened on first use (see trigger_queue)
+        self._trigger_queue = None
+        
+        # Per-project entry caches for the individual and combined web views
+        self._web_cache = ProjectEntryCache(count_duplicates=True)
+        self._combined_cache = ProjectEntryCache()
+        
+        # JSON-Patch feed of the combined view, loaded on first use (see delta_feed)
+        self._delta_feed = None
+        
+        # {community: {phase: projects}} and the task timeline of the last export (see _apply_rollups)
+        self.phase_counts = {}
+        self.schedule_index = ScheduleIndex()
+        self.project_index = AddressIndex()
         
         # Initialize Google Drive service
         self.drive_service = self._init_google_drive()
         
-        # Load customer data
-        self.customer_data = self._load_customer_data()
-        self.partner_data = self._load_partner_data()
+        # Load customer data (Customers / Contacts sheets, cached until the workbook changes)
+        self.workbook_loader = WorkbookLoader(self.master_files_path / "Master Schedule.xlsm",
+                                              self.state_path / "workbook_cache.json")
+        if customer_data is not None and partner_data is not None:
+            self.workbook = WorkbookSnapshot(customer_data, partner_data)
+        else:
+            self.workbook = self._load_workbook_data()
+            if customer_data is not None:
+                self.customer_data = customer_data
+            if partner_data is not None:
+                self.partner_data = partner_data
+        
+        # Background workbook reloads (see start_workbook_reloader)
+        self._workbook_reloader = None
+        self._adopted_workbook = None
         
         logging.info("Enhanced Master Schedule Automation initialized")
         
-        # Define lot pairings
-        self.lot_pairs = {
-            # Sunrise Estates
-            'Sunrise Estates': {
-                'pairs': [
-                    (81, 82),  # 346/354 Stockton
-                    (73, 74),  # 282/290 Stockton
-                    (65, 66),  # 224/230 Stockton
-                    (15, 46),  # 276/268 Merrick
-                    (16, 17),  # 284/292 Merrick
-                ],
-                'singles': [
-                    # Add any single lots here
-                ]
-            },
-            'Canal Landing': {
-                'pairs': [
-                    # West side lots
-                    (1, 2),    # 1160/1156 N Yost St
-                    (3, 4),    # 1152/1148 N Yost St
-
-                    
-                    # W Quinault Ave
-                    (5, 6),    # 4792/4780 W Quinault Pl
-                    (7, 8),    # 4774/4768 W Quinault Pl
-                    (9, 10),   # 4762/4756 W Quinault Pl
-                    (11, 12),  # 4750/4744 W Quinault Pl
-                    (13, 14),  # 4738/4732 W Quinault Pl
-                    (15, 16),  # 4726/1130 W Quinault/N Williams Pl
-                    (21, 22),  # 1133/1129 W Quinault Pl/N Yost Pl
-                    (25, 26),  # 4823/4817 W Quinault Pl
-                    (27, 28),  # 4811/4805 W Quinault Pl
-                    (29, 30),  # 4799/4793 W Quinault Pl           
-                    (31, 32),  # 4787/4781 W Quinault Pl
-                    (33, 34),  # 4775/4769 W Quinault Pl
-                    (35, 36),  # 4763/4757 W Quinault Pl
-                    (37, 38),  # 4751/4745 W Quinault Pl
-                    (39, 40),  # 4739/4733 W Quinault Pl
-
-                    # W Payette Pl
-                    (41, 42),  # 4724/4730 W Quinault Pl
-                    (43, 44),  # 4736/4742 W Quinault Pl
-                    (45, 46),  # 4748/4754 W Quinault Pl
-                    (47, 48),  # 4760/4766 W Quinault Pl
-                    (49, 50),  # 4772/4778 W Quinault Pl
-                    (51, 52),  # 4784/4790 W Quinault Pl
-                    (53, 54),  # 4796/4802 W Quinault Pl
-                    (55, 56),  # 4808/4814 W Quinault Pl
-                    (57, 58),  # 4820/4838 W Quinault Pl
-
-                    # N Williams Pl
-                    (17, 18),  # 1126/1122 N Williams Pl
-                    (93, 94),  # 1110/1114 N Williams Pl
-                    (91, 92),  # 1102/1106 N Williams Pl
-
-                    # N Yost Pl
-                    (23, 24),  # 1125/1121 N Yost Pl
-                    (59, 60),  # 1117/1113 N Yost Pl
-                    (61, 62),  # 1109/1107 N Yost Pl             
-                    
-                    # W Payette Pl
-                    (66, 67),  # 4845/4839 W Payette Pl
-                    (68, 69),  # 4833/4827 W Payette Pl
-                    (70, 71),  # 4821/4815 W Payette Pl
-                    (72, 73),  # 4809/4803 W Payette Pl
-                    (74, 75),  # 4797/4791 W Payette Pl
-                    (76, 77),  # 4785/4779 W Payette Pl
-                    (78, 79),  # 4773/4767 W Payette Pl
-                    (80, 81),  # 4761/4755 W Payette Pl
-                    (82, 83),  # 4749/4743 W Payette Pl
-                    (84, 85),  # 4737/4731 W Payette Pl
-                    (86, 87),  # 4725/4719 W Payette Pl
-                    (88, 89),  # 4713/4707 W Payette Pl                 
-                ],
-                'singles': [
-                    19,  # 4816 N Yost ST             
-                    20,  # 4822 W Quinault Pl
-                    95,  # 1118 N Williams Pl
-                    63,  # 1101 N Yost Pl
-                    64,  # 4857 W Payette Pl                    
-                    65,  # 4851 W Payette Pl
-                    90,  # 4701 W Payette Pl
-                    ]
-            }
-        }
+        # Duplex pairs / single lots with addresses (lot_pairs.json, reloaded when it changes)
+        self.lot_pairs = LotPairRegistry(CONFIG['LOT_PAIRS_FILE'] or DEFAULT_LOT_PAIRS)
 
-    def _load_customer_data(self):
-        """Load customer data from Excel"""
-        try:
-            excel_path = self.master_files_path / "Master Schedule.xlsm"
-            if excel_path.exists():
-                # Try to read the Customers sheet
-                try:
-                    df = pd.read_excel(excel_path, sheet_name='Customers', engine='openpyxl')
-                    return df.set_index('Address').to_dict('index')
-                except:
-                    logging.warning("Customers sheet not found in Excel")
-                    return {}
-            else:
-                logging.warning("Master Schedule Excel file not found")
-                return {}
-        except Exception as e:
-            logging.error(f"Error loading customer data: {e}")
-            return {}
+    @property
+    def customer_data(self):
+        """Customers sheet rows by address (read-only, from the current workbook snapshot)"""
+        return self.workbook.customers
+    
+    @customer_data.setter
+    def customer_data(self, customer_data):
+        self.workbook = WorkbookSnapshot(customer_data, self.workbook.contacts)
+    
+    @property
+    def partner_data(self):
+        """Contacts sheet rows (read-only, from the current workbook snapshot)"""
+        return self.workbook.contacts
+    
+    @partner_data.setter
+    def partner_data(self, partner_data):
+        self.workbook = WorkbookSnapshot(self.workbook.customers, partner_data)
     
-    def _load_partner_data(self):
-        """Load partner data from Excel"""
+    @property
+    def customer_index(self):
+        """Customers by canonical address ("W." / "Place" / double-space spellings still match)"""
+        return self.workbook.customer_index
+    
+    @property
+    def trigger_queue(self):
+        """Durable queue of trigger.txt events (coalesces bursts, survives crashes)"""
+        if self._trigger_queue is None:
+            self._trigger_queue = TriggerQueue(self.state_path / "trigger_queue.db")
+        return self._trigger_queue
+    
+    @property
+    def delta_feed(self):
+        """Versioned JSON-Patch chain of the published combined view"""
+        if self._delta_feed is None:
+            self._delta_feed = DeltaFeed(self.state_path / "delta_feed.json")
+        return self._delta_feed
+    
+    def _load_workbook_data(self):
+        """Load customer and partner data from Excel (one pass over the workbook, see workbook_loader)"""
+        stamp = self.workbook_loader.stamp()
+        if stamp is None:
+            logging.warning("Master Schedule Excel file not found")
+            return WorkbookSnapshot({}, [])
         try:
-            excel_path = self.master_files_path / "Master Schedule.xlsm"
-            if excel_path.exists():
-                # Try to read the Contacts sheet
-                try:
-                    df = pd.read_excel(excel_path, sheet_name='Contacts', engine='openpyxl')
-                    return df.to_dict('records')
-                except:
-                    logging.warning("Contacts sheet not found in Excel")
-                    return []
-            else:
-                logging.warning("Master Schedule Excel file not found")
-                return []
+            customers, contacts = self.workbook_loader.read(stamp)
+            return WorkbookSnapshot(customers, contacts, stamp)
         except Exception as e:
-            logging.error(f"Error loading partner data: {e}")
-            return []
+            logging.error(f"Error loading customer/partner data: {e}")
+            return WorkbookSnapshot({}, [])
+    
+    def start_workbook_reloader(self, interval=None):
+        """
+        Re-read the workbook in the background whenever it changes
+        
+        New customer / partner data is swapped in at the start of the next
+        run (see _adopt_workbook); a run in progress keeps the snapshot it
+        started with, and no run ever waits for Excel parsing.
+        
+        Args:
+            interval: Seconds between checks (default: CONFIG['WORKBOOK_RELOAD_SECONDS'])
+        """
+        interval = CONFIG['WORKBOOK_RELOAD_SECONDS'] if interval is None else interval
+        if self._workbook_reloader is None and interval > 0:
+            self._workbook_reloader = WorkbookReloader(self.workbook_loader, self.workbook, interval).start()
+            logging.info(f"Reloading customer/partner data when the workbook changes (checked every {interval:g}s)")
+        return self._workbook_reloader
+    
+    def stop_workbook_reloader(self):
+        if self._workbook_reloader is not None:
+            self._workbook_reloader.stop()
+            self._workbook_reloader = None
+    
+    def _adopt_workbook(self):
+        """Switch to the reloader's newest snapshot (called between runs only)"""
+        latest = self._workbook_reloader.snapshot if self._workbook_reloader else None
+        if latest is not None and latest is not self.workbook and latest is not self._adopted_workbook:
+            self.workbook = self._adopted_workbook = latest
+            logging.info(f"Using reloaded workbook data: {len(latest.customers)} customers, {len(latest.contacts)} contacts")
+    
     def _init_google_drive(self):
         """Initialize Google Drive API service"""
         if TEST_MODE:
@@ -201,6 +264,9 @@ class EnhancedScheduleAutomation:
             return None
                 
         try:
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+            
             creds_path = self.base_path / "Schedule System" / "Automation" / "config" / "service-account-key.json"
                 
             if not creds_path.exists():
@@ -222,57 +288,125 @@ class EnhancedScheduleAutomation:
     
     def parse_schedule_data(self):
         """Parse the schedule data from JSON export"""
-        json_path = self.temp_path / "schedule_data.json"
-        
-        if not json_path.exists():
-            logging.warning(f"JSON data not found at: {json_path}")
-            return []
+        enhanced_projects = self._load_projects()
         
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # VBA exports with 'projects' array
-            projects = data.get('projects', [])
-            enhanced_projects = []
-            
-            for project in projects:
-                # Check if project has lots info
-                lots = project.get('lots', '')
-                
-                # If lots contains a slash, it's a duplex - but VBA already split them
-                # So we just process each unit as-is
-                
-                # Determine current phase from schedule
-                if project.get('schedule'):
-                    today = datetime.now().date()
-                    current_phase = 'Planning'
-                    for task in project['schedule']:
-                        try:
-                            task_date = datetime.strptime(task['date'], '%Y-%m-%d').date()
-                            if task_date <= today:
-                                current_phase = task.get('phase', 'other')
-                        except:
-                            pass
-                    project['current_phase'] = current_phase
-                else:
-                    project['current_phase'] = 'Planning'
-                
-                # Look up customer info
-                customer_info = self.customer_data.get(project.get('address', ''), {})
-                project['customer_name'] = customer_info.get('Customer Name', 'Unknown')
-                project['customer_email'] = customer_info.get('Email Address', '')
-                
-                enhanced_projects.append(project)
-                logging.info(f"Parsed project: {project.get('address', 'Unknown')}")
-            
+        if enhanced_projects:
             logging.info(f"Successfully parsed {len(enhanced_projects)} projects from JSON data")
-            return enhanced_projects
-            
+        return enhanced_projects
+    
+    def _load_projects(self, json_path=None):
+        """Enriched projects of one export, or an empty list if it cannot be read completely"""
+        try:
+            projects = [self._enrich_project(project) for project in self._read_export(json_path)]
+            self._apply_rollups(projects)
+            return projects
         except Exception as e:
             logging.error(f"Error loading JSON data: {e}")
             return []
     
+    @property
+    def schedule_source(self):
+        """File runs read the schedule from (CONFIG['SCHEDULE_SOURCE'])"""
+        if CONFIG['SCHEDULE_SOURCE'] == 'workbook':
+            return self.master_files_path / "Master Schedule.xlsm"
+        return self.temp_path / "schedule_data.json"
+    
+    def _read_export(self, json_path=None):
+        """
+        Stream the raw projects from the VBA JSON export, one at a time
+        
+        An .xlsm / .xlsx path is read straight from the schedule grid instead,
+        producing the same project entries (see workbook_grid). Parse errors
+        are raised to the consumer, so a truncated export is never mistaken for
+        a shorter project list.
+        """
+        json_path = Path(json_path) if json_path else self.schedule_source
+        
+        if not json_path.exists():
+            logging.warning(f"JSON data not found at: {json_path}")
+            return
+        
+        if json_path.suffix.lower() in ('.xlsm', '.xlsx'):
+            yield from iter_grid_projects(json_path, CONFIG['GRID_SHEET'], CONFIG['GRID_RANGE'])
+            return
+        
+        # VBA exports with 'projects' array
+        yield from iter_export_projects(json_path)
+    
+    def _enrich_project(self, project):
+        """Add customer info to an exported project (phases etc. come from _apply_rollups)
+        
+        Returns:
+            Project: The export entry (dict) converted to the in-memory model
+        """
+        if isinstance(project, dict):
+            project = Project.from_json(project)
+        
+        # If lots contains a slash, it's a duplex - but VBA already split them
+        # So we just process each unit as-is
+        
+        # Look up customer info
+        customer_info = self.customer_index.get(project.address, {})
+        project.customer_name = customer_info.get('Customer Name', 'Unknown')
+        project.customer_email = customer_info.get('Email Address', '')
+        
+        logging.info(f"Parsed project: {project.address or 'Unknown'}")
+        return project
+    
+    def _apply_rollups(self, projects):
+        """Set current phase, completion % and est_finish of a whole export in one vectorized pass
+        
+        Also indexes the export's task timeline (see tasks_on / tasks_between).
+        """
+        # These projects replace the previous export everywhere below, so the
+        # interned task / phase tables can be trimmed to what they use
+        if compact_tables(project.schedule for project in projects):
+            logging.info(f"Compacted task tables to {len(TASKS.names)} task / {len(PHASES.names)} phase names")
+        rollups = compute_rollups(projects)
+        for project, phase, completion, finish in zip(projects, rollups['current_phase'],
+                                                      rollups['completion'], rollups['est_finish']):
+            project.current_phase = phase
+            project.completion = completion
+            project.est_finish = ordinal_text(finish) if finish != NO_DATE else None
+        self.phase_counts = rollups['summary']
+        self.schedule_index = ScheduleIndex(projects)
+        self.project_index = AddressIndex({project.address: project for project in projects})
+    
+    def find_project(self, address):
+        """Project of the last processed export at `address` (spelling-tolerant), None if unknown"""
+        return self.project_index.get(address)
+    
+    def tasks_on(self, day):
+        """
+        Tasks of the last processed export scheduled on one day
+        
+        Args:
+            day: date, ISO string or day ordinal
+        
+        Returns:
+            list: ScheduledTask (.date, .task, .phase, .project) in project order
+        """
+        return self.schedule_index.on(day)
+    
+    def tasks_between(self, start=None, end=None):
+        """Tasks of the last processed export dated start..end (inclusive, None = open), by date"""
+        return self.schedule_index.between(start, end)
+    
+    def tasks_for_trade(self, task, start=None, end=None):
+        """
+        Occurrences of a task (or list of task names) across all projects
+        of the last processed export, dated start..end (inclusive), by date
+        
+        Example: tasks_for_trade('Paint', today, today + 14)
+        """
+        return self.schedule_index.for_task(task, start, end)
+    
+    def _index_for(self, projects):
+        """Task index of `projects` (the one built with the rollups unless they differ)"""
+        if self.schedule_index.projects == list(projects):
+            return self.schedule_index
+        return ScheduleIndex(projects)
+    
     def _determine_current_phase(self, text):
         """Determine current phase from schedule text"""
         phases = ["Foundation", "Framing", "Roofing", "Electrical", "Plumbing", 
@@ -287,32 +421,12 @@ class EnhancedScheduleAutomation:
         return current_phase
     
     def _categorize_task(self, task):
-        """Categorize task into construction phase"""
-        task_lower = task.lower()
-        
-        phase_keywords = {
-            'foundation': ['foundation', 'concrete', 'slab', 'footing'],
-            'framing': ['frame', 'framing', 'lumber', 'walls', 'roof deck'],
-            'roofing': ['roof', 'shingle', 'roofing', 'gutters'],
-            'electrical': ['electrical', 'wire', 'electric', 'panel'],
-            'plumbing': ['plumb', 'pipe', 'water', 'sewer'],
-            'insulation': ['insulation', 'insulate', 'vapor'],
-            'drywall': ['drywall', 'sheetrock', 'mud', 'tape'],
-            'flooring': ['floor', 'tile', 'carpet', 'hardwood'],
-            'painting': ['paint', 'primer', 'stain'],
-            'finishing': ['finish', 'trim', 'cabinet', 'countertop'],
-            'final': ['final', 'inspection', 'walk', 'clean']
-        }
-        
-        for phase, keywords in phase_keywords.items():
-            if any(keyword in task_lower for keyword in keywords):
-                return phase
-        
-        return 'other'
+        """Categorize task into construction phase (shared table, see task_categories.py)"""
+        return categorize_task(task)
     
     def _get_sample_projects(self):
         """Return sample projects for testing"""
-        return [
+        samples = [
             {
                 "project_id": "346",
                 "customer_name": "Smith",
@@ -344,10 +458,11 @@ class EnhancedScheduleAutomation:
                 ]
             }
         ]
+        return [Project.from_json(sample) for sample in samples]
     
     def create_project_folders(self, project):
         """Create folder structure for a project"""
-        project_folder = f"{project['project_id']} - {project['customer_name']}"
+        project_folder = f"{project.project_id} - {project.customer_name}"
         
         # Create internal project folders
         internal_path = self.projects_path / project_folder
@@ -363,8 +478,8 @@ class EnhancedScheduleAutomation:
             (internal_path / folder).mkdir(parents=True, exist_ok=True)
         
         # Create customer portal folders
-        if project['customer_email']:
-            portal_path = self.portals_path / project['customer_email'] / project_folder
+        if project.customer_email:
+            portal_path = self.portals_path / project.customer_email / project_folder
             portal_folders = ["Schedule", "Documents", "Selections", "Photos"]
             
             for folder in portal_folders:
@@ -381,7 +496,7 @@ class EnhancedScheduleAutomation:
         # Save to internal project folder
         schedule_file = internal_path / "Customer_Data" / "Schedule" / "project_schedule.json"
         with open(schedule_file, 'w') as f:
-            json.dump(project, f, indent=2)
+            json.dump(project.to_json(), f, indent=2)
         
         # Generate HTML view
         html_content = self._generate_schedule_html(project)
@@ -393,13 +508,13 @@ class EnhancedScheduleAutomation:
         if portal_path:
             # Create customer-friendly version
             customer_data = {
-                "project_name": f"{project['customer_name']} Residence",
-                "address": project['address'],
-                "community": project['community'],
-                "sqft": project['sqft'],
-                "current_phase": project['current_phase'],
-                "schedule": project['schedule'],
-                "completion_percentage": self._calculate_completion(project['schedule']),
+                "project_name": f"{project.customer_name} Residence",
+                "address": project.address,
+                "community": project.community,
+                "sqft": project.sqft,
+                "current_phase": project.current_phase,
+                "schedule": project.schedule.to_json(),
+                "completion_percentage": project.completion,
                 "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             
@@ -412,36 +527,18 @@ class EnhancedScheduleAutomation:
             portal_html = portal_path / "Schedule" / "schedule_view.html"
             shutil.copy2(html_file, portal_html)
         
-        logging.info(f"Saved schedule for: {project['customer_name']}")
-    
-    def _calculate_completion(self, schedule):
-        """Calculate project completion percentage"""
-        if not schedule:
-            return 0
-        
-        today = datetime.now().date()
-        completed = 0
-        
-        for item in schedule:
-            try:
-                task_date = datetime.strptime(item['date'], '%Y-%m-%d').date()
-                if task_date <= today:
-                    completed += 1
-            except:
-                pass
-        
-        return round((completed / len(schedule)) * 100, 1)
+        logging.info(f"Saved schedule for: {project.customer_name}")
     
     def _generate_schedule_html(self, project):
         """Generate HTML view for project schedule"""
-        completion = self._calculate_completion(project['schedule'])
+        completion = project.completion
         
         html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Schedule - {project['address']}</title>
+    <title>Schedule - {project.address}</title>
     <style>
         body {{
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif;
@@ -597,18 +694,18 @@ class EnhancedScheduleAutomation:
 <body>
     <div class="container">
         <div class="header">
-            <h1>{project['address']}</h1>
-            <p>{project['community']} • {project['customer_name']} Residence</p>
+            <h1>{project.address}</h1>
+            <p>{project.community} • {project.customer_name} Residence</p>
         </div>
         
         <div class="info-grid">
             <div class="info-card">
                 <div class="label">Square Footage</div>
-                <div class="value">{project['sqft']} sq ft</div>
+                <div class="value">{project.sqft} sq ft</div>
             </div>
             <div class="info-card">
                 <div class="label">Current Phase</div>
-                <div class="value">{project['current_phase']}</div>
+                <div class="value">{project.current_phase}</div>
             </div>
             <div class="info-card">
                 <div class="label">Overall Progress</div>
@@ -635,27 +732,25 @@ class EnhancedScheduleAutomation:
                 <tbody>
 """
         
-        today = datetime.now().date()
+        today = today_ordinal()
         
-        for item in project['schedule']:
-            task_date = datetime.strptime(item['date'], '%Y-%m-%d').date()
-            
+        for ordinal, _date_text, task, phase in project.schedule.rows():
             # Determine status
-            if task_date < today:
+            if ordinal < today:
                 status = '<span class="status-completed">✓ Completed</span>'
-            elif task_date == today:
+            elif ordinal == today:
                 status = '<span class="status-today">● In Progress</span>'
             else:
                 status = '<span class="status-upcoming">◌ Upcoming</span>'
             
             # Format date
-            formatted_date = task_date.strftime('%B %d, %Y')
+            formatted_date = date.fromordinal(ordinal).strftime('%B %d, %Y')
             
             html += f"""
                     <tr>
                         <td>{formatted_date}</td>
-                        <td>{item['task']}</td>
-                        <td><span class="phase-badge phase-{item['phase']}">{item['phase'].title()}</span></td>
+                        <td>{task}</td>
+                        <td><span class="phase-badge phase-{phase}">{phase.title()}</span></td>
                         <td>{status}</td>
                     </tr>
 """
@@ -672,27 +767,39 @@ class EnhancedScheduleAutomation:
     
     def send_notifications(self, trigger_data, projects):
         """Send email notifications"""
+        for message in self.build_notifications(trigger_data, projects):
+            self._send_email(**message)
+    
+    def build_notifications(self, trigger_data, projects):
+        """Yield the emails requested by the trigger file as _send_email arguments"""
         if trigger_data.get('TRADE_EMAIL') == 'True':
-            self._send_trade_partner_emails(projects)
+            message = self._build_trade_partner_email(projects)
+            if message:
+                yield message
         
         if trigger_data.get('CUSTOMER_EMAIL') == 'True':
-            self._send_customer_emails(projects)
+            for project in projects:
+                message = self._build_customer_email(project)
+                if message:
+                    yield message
     
-    def _send_trade_partner_emails(self, projects):
-        """Send email to trade partners"""
+    def _build_trade_partner_email(self, projects):
+        """Build the weekly email to trade partners"""
         if not self.partner_data:
             logging.warning("No partner email data available")
-            return
+            return None
         
         subject = f"Weekly Schedule Update - {datetime.now().strftime('%B %d, %Y')}"
         
-        # Group projects by current phase
-        phase_groups = {}
-        for project in projects:
-            phase = project['current_phase']
-            if phase not in phase_groups:
-                phase_groups[phase] = []
-            phase_groups[phase].append(project)
+        # Upcoming work per trade (task name), straight from the task index
+        index = self._index_for(projects)
+        days = CONFIG['TRADE_LOOKAHEAD_DAYS']
+        today = today_ordinal()
+        trade_work = []
+        for task in index.task_names():
+            upcoming = index.for_task(task, today, today + days)
+            if upcoming:
+                trade_work.append((task, upcoming))
         
         # Build email body
         body = """
@@ -701,39 +808,31 @@ class EnhancedScheduleAutomation:
     <style>
         body { font-family: Arial, sans-serif; color: #333; }
         h2 { color: #2c3e50; }
-        .phase-section { margin: 20px 0; }
-        .project-item { margin: 10px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }
+        .trade-section { margin: 20px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }
     </style>
 </head>
 <body>
     <h2>Weekly Construction Schedule Update</h2>
     <p>Dear Trade Partners,</p>
-    <p>Please find below this week's schedule update:</p>
 """
+        body += f"    <p>Please find below the work scheduled for the next {days} days, by trade:</p>\n"
         
-        for phase, phase_projects in sorted(phase_groups.items()):
+        for task, upcoming in trade_work:
             body += f"""
-    <div class="phase-section">
-        <h3>{phase} Phase</h3>
-"""
-            for project in phase_projects:
-                upcoming_tasks = [task for task in project['schedule'] 
-                                if datetime.strptime(task['date'], '%Y-%m-%d').date() >= datetime.now().date()][:3]
-                
-                body += f"""
-        <div class="project-item">
-            <strong>{project['address']} - {project['community']}</strong><br>
-            Upcoming work:
-            <ul>
+    <div class="trade-section">
+        <h3>{task}</h3>
+        <ul>
 """
-                for task in upcoming_tasks:
-                    body += f"<li>{task['date']}: {task['task']}</li>"
-                
-                body += """
-            </ul>
-        </div>
+            for item in upcoming:
+                body += f"<li>{item.date}: {item.project.address} - {item.project.community}</li>"
+            
+            body += """
+        </ul>
+    </div>
 """
-            body += "</div>"
+        
+        if not trade_work:
+            body += f"\n    <p>No work is scheduled in the next {days} days.</p>\n"
         
         body += """
     <p>Please review the attached master schedule for complete details.</p>
@@ -745,41 +844,34 @@ class EnhancedScheduleAutomation:
         # Send emails
         partner_emails = [p['Email Address'] for p in self.partner_data if 'Email Address' in p]
         
-        if partner_emails:
-            self._send_email(
-                to_emails=partner_emails,
-                subject=subject,
-                body=body,
-                is_html=True,
-                use_bcc=True,
-                attachment=str(self.public_path / "Master Schedule.pdf")
-            )
+        if not partner_emails:
+            return None
+        
+        return {
+            'to_emails': partner_emails,
+            'subject': subject,
+            'body': body,
+            'is_html': True,
+            'use_bcc': True,
+            'attachment': str(self.public_path / "Master Schedule.pdf")
+        }
     
-    def _send_customer_emails(self, projects):
-        """Send individual emails to customers"""
-        for project in projects:
-            if not project.get('customer_email'):
-                continue
-            
-            subject = f"Your Home Progress Update - {project['address']}"
-            
-            completion = self._calculate_completion(project['schedule'])
-            
-            # Get upcoming tasks
-            today = datetime.now().date()
-            upcoming_tasks = []
-            completed_this_week = []
-            
-            for task in project['schedule']:
-                task_date = datetime.strptime(task['date'], '%Y-%m-%d').date()
-                days_diff = (task_date - today).days
-                
-                if -7 <= days_diff < 0:
-                    completed_this_week.append(task)
-                elif 0 <= days_diff <= 14:
-                    upcoming_tasks.append(task)
-            
-            body = f"""
+    def _build_customer_email(self, project):
+        """Build the progress update email for one customer"""
+        if not project.customer_email:
+            return None
+        
+        subject = f"Your Home Progress Update - {project.address}"
+        
+        completion = project.completion
+        
+        # Get upcoming tasks
+        today = today_ordinal()
+        window = self.schedule_index.project_tasks(project, today - 7, today + 14)
+        completed_this_week = [item for item in window if item.ordinal < today]
+        upcoming_tasks = [item for item in window if item.ordinal >= today]
+        
+        body = f"""
 <html>
 <head>
     <style>
@@ -794,58 +886,58 @@ class EnhancedScheduleAutomation:
 <body>
     <div class="header">
         <h2>Progress Update for Your New Home</h2>
-        <p>{project['address']} • {project['community']}</p>
+        <p>{project.address} • {project.community}</p>
     </div>
     
     <div class="section">
         <h3>Project Overview</h3>
-        <p><strong>Current Phase:</strong> {project['current_phase']}</p>
+        <p><strong>Current Phase:</strong> {project.current_phase}</p>
         <p><strong>Overall Progress:</strong> {completion}%</p>
         <div class="progress-bar">
             <div class="progress-fill"></div>
         </div>
     </div>
 """
-            
-            if completed_this_week:
-                body += """
+        
+        if completed_this_week:
+            body += """
     <div class="section">
         <h3>Completed This Week</h3>
         <div class="task-list">
             <ul>
 """
-                for task in completed_this_week:
-                    body += f"<li>{task['task']} ✓</li>"
-                body += """
+            for item in completed_this_week:
+                body += f"<li>{item.task} ✓</li>"
+            body += """
             </ul>
         </div>
     </div>
 """
-            
-            if upcoming_tasks:
-                body += """
+        
+        if upcoming_tasks:
+            body += """
     <div class="section">
         <h3>Upcoming Work</h3>
         <div class="task-list">
             <ul>
 """
-                for task in upcoming_tasks:
-                    date_str = datetime.strptime(task['date'], '%Y-%m-%d').strftime('%B %d')
-                    body += f"<li>{date_str}: {task['task']}</li>"
-                body += """
+            for item in upcoming_tasks:
+                date_str = date.fromordinal(item.ordinal).strftime('%B %d')
+                body += f"<li>{date_str}: {item.task}</li>"
+            body += """
             </ul>
         </div>
     </div>
 """
+        
+        # Add estimated completion dates
+        last_task_date = project.schedule.last_date()
+        if last_task_date != NO_DATE:
+            est_completion = datetime.fromordinal(last_task_date)
+            est_closing = est_completion + timedelta(days=7)
+            est_signing = est_closing - timedelta(days=1)
             
-            # Add estimated completion dates
-            if project['schedule']:
-                last_task_date = max(task['date'] for task in project['schedule'])
-                est_completion = datetime.strptime(last_task_date, '%Y-%m-%d')
-                est_closing = est_completion + timedelta(days=7)
-                est_signing = est_closing - timedelta(days=1)
-                
-                body += f"""
+            body += f"""
     <div class="section">
         <h3>Important Dates</h3>
         <p><strong>Estimated Completion:</strong> {est_completion.strftime('%B %d, %Y')}</p>
@@ -853,23 +945,29 @@ class EnhancedScheduleAutomation:
         <p><strong>Estimated Signing:</strong> {est_signing.strftime('%B %d, %Y')}</p>
     </div>
 """
-            
-            body += """
+        
+        body += """
     <p>Thank you for choosing Ambience Homes! If you have any questions, please don't hesitate to reach out.</p>
     <p>Best regards,<br>Your Ambience Homes Team</p>
 </body>
 </html>
 """
-            
-            self._send_email(
-                to_emails=[project['customer_email']],
-                subject=subject,
-                body=body,
-                is_html=True
-            )
-    
+        
+        return {
+            'to_emails': [project.customer_email],
+            'subject': subject,
+            'body': body,
+            'is_html': True
+        }
+
     def _send_email(self, to_emails, subject, body, is_html=False, use_bcc=False, attachment=None):
         """Send email using Gmail SMTP"""
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.base import MIMEBase
+        from email import encoders
+        
         try:
             msg = MIMEMultipart()
             msg['From'] = CONFIG['GMAIL_USER']
@@ -911,246 +1009,536 @@ class EnhancedScheduleAutomation:
         except Exception as e:
             logging.error(f"Failed to send email: {e}")
     
-    def generate_web_data(self, projects):
-        """Generate data for web display - both individual and combined views"""
+    def check_trigger_file(self):
+        """Queue any trigger file written by the Excel macro and claim the next
+        batch once the export burst has settled (None while it is still settling)"""
+        if self.trigger_queue.ingest_file(self.temp_path / "trigger.txt"):
+            logging.info("Trigger file found - queued")
         
-        # Individual view for customers (keep as-is from VBA export)
-        web_data = {
-            'lastUpdated': datetime.now().isoformat(),
-            'projects': {},
-            'summary': {
-                'totalProjects': len(projects),
-                'phases': {}
-            }
-        }
+        return self.trigger_queue.claim(
+            settle=CONFIG['TRIGGER_SETTLE_SECONDS'],
+            max_wait=CONFIG['TRIGGER_MAX_WAIT_SECONDS']
+        )
+    
+    def trigger_wait(self):
+        """Seconds until the queued triggers can be claimed (0 = now, None = nothing queued)"""
+        return self.trigger_queue.settle_remaining(
+            settle=CONFIG['TRIGGER_SETTLE_SECONDS'],
+            max_wait=CONFIG['TRIGGER_MAX_WAIT_SECONDS']
+        )
+    
+    def process_export(self):
+        """Run one processing pass over the current export
         
-        # Combined view for construction team
-        combined_data = {
-            'lastUpdated': datetime.now().isoformat(),
-            'projects': {},
-            'summary': {
-                'totalProjects': 0,
-                'phases': {}
-            }
-        }
+        Returns:
+            bool: False if a pipeline stage failed (the claimed trigger is
+                  returned to the queue for the next attempt)
+        """
+        # Customer / partner data stays fixed for the whole run
+        self._adopt_workbook()
         
-        # Process individual projects first (for web_data)
-        for project in projects:
-            # Create key from community and address
-            project_key = f"{project['community']}_{project['address']}".replace(' ', '_').replace('__', '_')
+        batch = self.check_trigger_file()
+        if batch is None and self.trigger_wait():
+            # More exports may follow: the whole burst is processed in one run
+            # once it has settled (main() wakes up for it, see trigger_wait)
+            logging.info("Trigger queued - waiting for the export burst to settle")
+            return True
+        trigger_data = batch.data if batch else None
+        
+        # Emails are only sent when explicitly enabled; a trigger alone is not enough
+        if trigger_data and wants_email(trigger_data) and not CONFIG['SEND_EMAILS']:
+            logging.info("Trigger asks for emails, but SEND_EMAILS is off - not sending")
+            trigger_data = None
+        
+        # Skip the whole pipeline if neither the export, the workbook nor the lot
+        # pairs changed. The workbook counts in the version this run renders with
+        # (the snapshot's stamp), not the file on disk, which the reloader may not
+        # have picked up yet. Current phase and completion % depend on today's
+        # date, so it is part of the key.
+        self.lot_pairs.refresh()
+        fingerprint = datetime.now().date().isoformat() + ':' + self.fingerprints.fingerprint(
+            self.schedule_source,
+            self.workbook.stamp,
+            self.lot_pairs.stamp
+        )
+        unchanged = self.fingerprints.matches('inputs', fingerprint)
+        if unchanged and not (trigger_data and wants_email(trigger_data)):
+            if batch:
+                self.trigger_queue.complete(batch)
+            self.metrics['skipped_unchanged'] += 1
+            logging.info(f"Run skipped: unchanged ({self.metrics['skipped_unchanged']} skipped, {self.metrics['runs']} processed)")
+            return True
+        
+        from pipeline_runner import PipelineRunner, Stage
+        
+        rendered = []
+        
+        def load(path):
+            # The whole export in one worker-thread call: stream it and enrich
+            # each project (no per-project thread hop; render needs them all anyway).
+            # A read error fails the stage, so a partial export is never rendered.
+            return [self._enrich_project(project) for project in self._read_export(path)]
+        
+        def render(projects):
+            if projects and not unchanged:
+                rendered.append(True)
+            return self._render_outputs(projects, trigger_data, not unchanged)
+        
+        # load -> render -> publish. Loading and rendering run one after the
+        # other; the concurrency is in publish, where the sync folder copies and
+        # emails run side by side and start as soon as render yields them.
+        pipeline = PipelineRunner([
+            Stage('load', load),
+            Stage('render', render, fan_out=True),
+            Stage('publish', lambda job: job(), workers=CONFIG['PUBLISH_WORKERS']),
+        ])
+        try:
+            published = pipeline.run([self.schedule_source])
+        except BaseException:
+            if batch:
+                self.trigger_queue.release(batch)
+            raise
+        
+        if pipeline.errors:
+            logging.error(f"Run failed ({pipeline.errors} error(s))" + (" - trigger kept for retry" if batch else ""))
+            if batch:
+                self.trigger_queue.release(batch)
+            return False
+        
+        # Remember these inputs only once every sync folder has the new files,
+        # so a failed copy (share offline, file locked) is retried next run
+        if rendered and all(published):
+            self.fingerprints.record('inputs', fingerprint)
+        
+        if batch:
+            self.trigger_queue.complete(batch)
+        return True
+    
+    def process_pending(self, wait=False):
+        """Process the current export and every trigger that has settled
+        
+        Stops at the first failed run; its trigger stays queued and is retried
+        on the next export event (or restart). Triggers of a burst that is
+        still settling are left for the monitoring loop unless `wait` is set.
+        
+        Args:
+            wait: Sleep until settling triggers can be claimed (one-shot runs)
+        """
+        if not self.process_export():
+            return
+        while True:
+            remaining = self.trigger_wait()
+            if remaining is None or (remaining and not wait):
+                return
+            if remaining:
+                time.sleep(remaining)
+            if not self.process_export():
+                return
+    
+    def process_batch(self, export_dir, output_dir=None, workers=1):
+        """
+        Process a directory of VBA exports in one process (backfills)
+        
+        The workbook data is loaded once and shared by every export. Each
+        export's web data goes to its own folder under output_dir; nothing is
+        copied to the sync folders and no emails are sent.
+        
+        Args:
+            export_dir: Folder containing schedule_data.json style exports
+            output_dir: Where to write the results (default: export_dir/web_data)
+            workers: Number of worker processes (1 = process sequentially)
+        
+        Returns:
+            dict: export file name -> number of projects processed
+        """
+        export_dir = Path(export_dir)
+        output_dir = Path(output_dir) if output_dir else export_dir / 'web_data'
+        exports = sorted(path for path in export_dir.glob('*.json') if path.is_file())
+        
+        logging.info(f"Batch processing {len(exports)} exports from {export_dir} ({workers} worker(s))")
+        started = datetime.now()
+        
+        jobs = [(path, output_dir / path.stem) for path in exports]
+        if workers > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
             
-            # Individual view entry
-            web_data['projects'][project_key] = {
-                'community': project['community'],
-                'address': project['address'],
-                'customer_name': project.get('customer_name', 'Unknown'),
-                'sqft': project.get('sqft', ''),
-                'current_phase': project.get('current_phase', 'Planning'),
-                'completion_percentage': self._calculate_completion(project.get('schedule', [])),
-                'schedule': project.get('schedule', [])
-            }
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(self.workbook,)
+            ) as pool:
+                counts = list(pool.map(_process_batch_export, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+        else:
+            counts = [self.process_export_file(path, out) for path, out in jobs]
+        
+        results = {path.name: count for (path, _), count in zip(jobs, counts)}
+        elapsed = (datetime.now() - started).total_seconds()
+        logging.info(f"Batch finished: {len(results)} exports, {sum(counts)} projects in {elapsed:.1f}s")
+        return results
+    
+    def process_export_file(self, export_path, output_dir):
+        """Parse one export file and write its web data to output_dir"""
+        projects = self._load_projects(export_path)
+        if projects:
+            self.generate_web_data(projects, copy_outputs=False, output_dir=output_dir)
+        return len(projects)
+    
+    def _render_outputs(self, projects, trigger_data, refresh):
+        """
+        Render stage: write the web data and yield the publish jobs
+        
+        Args:
+            projects: Enriched projects in export order
+            trigger_data: Parsed trigger file (or None)
+            refresh: False if the web data is current (only notifications are sent)
+        
+        The copy jobs return True / False (see _publish_outputs); the caller
+        records the input fingerprint only when all of them succeeded.
+        """
+        if not projects:
+            logging.info("No projects found. Waiting for next export.")
+            return
+        
+        self._apply_rollups(projects)
+        logging.info(f"Successfully parsed {len(projects)} projects from JSON data")
+        self.metrics['runs'] += 1
+        
+        if refresh:
+            outputs = self.build_web_outputs(projects, self.delta_feed)
+            self._write_public_outputs(self.public_path, outputs)
+            logging.info("Web data generated and saved.")
             
-            # Count phases
-            phase = project.get('current_phase', 'Planning')
-            if phase not in web_data['summary']['phases']:
-                web_data['summary']['phases'][phase] = 0
-            web_data['summary']['phases'][phase] += 1
+            for destination, label in self._copy_destinations():
+                yield partial(self._publish_outputs, destination, outputs, label)
         
-        # Create a mapping of community/lot to project for easy lookup
-        lot_to_project = {}
-        for project in projects:
-            # Normalize community
-            community = project['community'].strip()
-            # Extract lot number (handle 'Lot 81', '81', etc.)
-            lot_field = project.get('lots', '')
-            match = re.search(r'\d+', lot_field)
-            if match:
-                lot_num = int(match.group())
-                key = f"{community}_{lot_num}"
-                lot_to_project[key] = project
-        
-        # Parse lot pairs with addresses from the configuration
-        # This requires updating lot_pairs to include address info
-        # For now, we'll create the mapping based on the structure
-        lot_pairs_with_addresses = {
-            'Sunrise Estates': {
-                'pairs': [
-                    {'lots': (81, 82), 'addresses': ('346 Stockton', '354 Stockton')},
-                    {'lots': (73, 74), 'addresses': ('282 Stockton', '290 Stockton')},
-                    {'lots': (65, 66), 'addresses': ('224 Stockton', '230 Stockton')},
-                    {'lots': (15, 46), 'addresses': ('276 Merrick', '268 Merrick')},
-                    {'lots': (16, 17), 'addresses': ('284 Merrick', '292 Merrick')},
-                ]
-            },
-            'Canal Landing': {
-                'pairs': [
-                    {'lots': (1, 2), 'addresses': ('1160 N Yost St', '1156 N Yost St')},
-                    {'lots': (3, 4), 'addresses': ('1152 N Yost St', '1148 N Yost St')},
-                    {'lots': (5, 6), 'addresses': ('4792 W Quinault Pl', '4780 W Quinault Pl')},
-                    {'lots': (7, 8), 'addresses': ('4774 W Quinault Pl', '4768 W Quinault Pl')},
-                    {'lots': (9, 10), 'addresses': ('4762 W Quinault Pl', '4756 W Quinault Pl')},
-                    {'lots': (11, 12), 'addresses': ('4750 W Quinault Pl', '4744 W Quinault Pl')},
-                    {'lots': (13, 14), 'addresses': ('4738 W Quinault Pl', '4732 W Quinault Pl')},
-                    {'lots': (15, 16), 'addresses': ('4726 W Quinault Pl', '1130 N Williams Pl')},
-                    {'lots': (21, 22), 'addresses': ('1133 N Yost Pl', '1129 N Yost Pl')},
-                    # ... continue for all pairs
-                ],
-                'singles': [
-                    {'lot': 19, 'address': '4816 N Yost St'},
-                    {'lot': 20, 'address': '4822 W Quinault Pl'},
-                    {'lot': 95, 'address': '1118 N Williams Pl'},
-                    {'lot': 63, 'address': '1101 N Yost Pl'},
-                    {'lot': 64, 'address': '4857 W Payette Pl'},
-                    {'lot': 65, 'address': '4851 W Payette Pl'},
-                    {'lot': 90, 'address': '4701 W Payette Pl'},
-                ]
-            }
-        }
+        if trigger_data:
+            for message in self.build_notifications(trigger_data, projects):
+                yield partial(self._send_email, **message)
+    
+    def build_web_outputs(self, projects, feed=None):
+        """Render the dashboard files (individual and combined views, shards, manifest)
+        
+        Args:
+            projects: Enriched projects in export order
+            feed: DeltaFeed to advance with the combined view (live runs only)
         
-        # Track which projects we've already processed
-        processed_projects = set()
+        Returns:
+            dict: file name -> bytes (None for a variant that is not produced)
+        """
+        last_updated = datetime.now().isoformat()
+        today = datetime.now().date().isoformat()
         
-        # Process based on lot pairings with addresses
-        for community, config in lot_pairs_with_addresses.items():
-            # Process pairs
-            for pair_info in config.get('pairs', []):
-                lot1, lot2 = pair_info['lots']
-                addr1, addr2 = pair_info['addresses']
+        # Digest of each project's inputs; completion % depends on today's date
+        digests = {id(project): project_digest(today, project.digest_parts()) for project in projects}
+        
+        # Individual view for customers (keep as-is from VBA export)
+        def individual_entries():
+            for project in projects:
+                # Create key from community and address
+                project_key = f"{project.community}_{project.address}".replace(' ', '_').replace('__', '_')
                 
-                key1 = f"{community}_{lot1}"
-                key2 = f"{community}_{lot2}"
+                def build(project=project):
+                    return {
+                        'community': project.community,
+                        'address': project.address,
+                        'customer_name': project.customer_name,
+                        'sqft': project.sqft,
+                        'current_phase': project.current_phase,
+                        'completion_percentage': project.completion,
+                        'est_finish': project.est_finish,
+                        'schedule': project.schedule.to_json()
+                    }
                 
-                if key1 in lot_to_project and key2 in lot_to_project:
-                    proj1 = lot_to_project[key1]
-                    proj2 = lot_to_project[key2]
-                    
-                    # Mark as processed
-                    processed_projects.add(id(proj1))
-                    processed_projects.add(id(proj2))
+                yield project_key, digests[id(project)], build
+        
+        self._web_cache.update(individual_entries())
+        
+        # Pair record of each project's lot: one index lookup per project
+        registry = self.lot_pairs.refresh()
+        lot_to_project = {}
+        matched = {}
+        for project in projects:
+            # Normalize community; lot number from 'Lot 81', '81', etc.
+            community = community_key(project.community)
+            lot_num = lot_number(project.lots)
+            record = registry.lookup(community, lot_num) if lot_num is not None else None
+            if record is not None:
+                lot_to_project[(community, lot_num)] = project
+                matched[record.order] = record
+        
+        # Combined view for construction team
+        def combined_entries():
+            # Track which projects we've already processed
+            processed_projects = set()
+            
+            # Matched pairs and singles, in registry order
+            for order in sorted(matched):
+                record = matched[order]
+                community = record.community
+                
+                if record.is_pair:
+                    lot1, lot2 = record.lots
+                    addr1, addr2 = record.addresses
                     
-                    # Create combined entry with full addresses
-                    combined_key = f"{community}_{lot1}_{lot2}".replace(' ', '_')
+                    key1 = (community_key(community), lot1)
+                    key2 = (community_key(community), lot2)
                     
-                    combined_data['projects'][combined_key] = {
-                        'community': community,
-                        'address': f"{addr1} / {addr2}",
-                        'customer_name': f"{proj1.get('customer_name', 'Unknown')} / {proj2.get('customer_name', 'Unknown')}",
-                        'sqft': proj1.get('sqft', ''),
-                        'lots': f"Lots {lot1}/{lot2}",
-                        'current_phase': proj1.get('current_phase', 'Planning'),
-                        'completion_percentage': self._calculate_completion(proj1.get('schedule', [])),
-                        'schedule': proj1.get('schedule', []),
-                        'is_duplex': True
-                    }
-            
-            # Process singles with their addresses
-            for single_info in config.get('singles', []):
-                lot_num = single_info['lot']
-                address = single_info['address']
+                    if key1 in lot_to_project and key2 in lot_to_project:
+                        proj1 = lot_to_project[key1]
+                        proj2 = lot_to_project[key2]
+                        
+                        # Mark as processed
+                        processed_projects.add(id(proj1))
+                        processed_projects.add(id(proj2))
+                        
+                        # Create combined entry with full addresses
+                        combined_key = f"{community}_{lot1}_{lot2}".replace(' ', '_')
+                        
+                        def build(proj1=proj1, proj2=proj2, community=community,
+                                  lot1=lot1, lot2=lot2, addr1=addr1, addr2=addr2):
+                            return {
+                                'community': community,
+                                'address': f"{addr1} / {addr2}",
+                                'customer_name': f"{proj1.customer_name} / {proj2.customer_name}",
+                                'sqft': proj1.sqft,
+                                'lots': f"Lots {lot1}/{lot2}",
+                                'current_phase': proj1.current_phase,
+                                'completion_percentage': proj1.completion,
+                                'est_finish': proj1.est_finish,
+                                'schedule': proj1.schedule.to_json(),
+                                'is_duplex': True
+                            }
+                        
+                        digest = project_digest(digests[id(proj1)], digests[id(proj2)], community, record.info)
+                        yield combined_key, digest, build
                 
-                key = f"{community}_{lot_num}"
-                if key in lot_to_project:
-                    project = lot_to_project[key]
+                else:
+                    # Single with its address
+                    lot_num, = record.lots
+                    address, = record.addresses
+                    
+                    project = lot_to_project[(community_key(community), lot_num)]
                     processed_projects.add(id(project))
                     
                     single_key = f"{community}_{lot_num}".replace(' ', '_')
-                    combined_data['projects'][single_key] = {
-                        'community': community,
-                        'address': address,
-                        'customer_name': project.get('customer_name', 'Unknown'),
-                        'sqft': project.get('sqft', ''),
-                        'lots': f"Lot {lot_num}",
-                        'current_phase': project.get('current_phase', 'Planning'),
-                        'completion_percentage': self._calculate_completion(project.get('schedule', [])),
-                        'schedule': project.get('schedule', []),
-                        'is_duplex': False
-                    }
+                    
+                    def build(project=project, community=community, lot_num=lot_num, address=address):
+                        return {
+                            'community': community,
+                            'address': address,
+                            'customer_name': project.customer_name,
+                            'sqft': project.sqft,
+                            'lots': f"Lot {lot_num}",
+                            'current_phase': project.current_phase,
+                            'completion_percentage': project.completion,
+                            'est_finish': project.est_finish,
+                            'schedule': project.schedule.to_json(),
+                            'is_duplex': False
+                        }
+                    
+                    digest = project_digest(digests[id(project)], community, record.info)
+                    yield single_key, digest, build
+            
+            # Process any remaining projects as singles (shouldn't be any if lot_pairs is complete)
+            for project in projects:
+                if id(project) not in processed_projects:
+                    single_key = f"{project.community}_{project.address}".replace(' ', '_')
+                    
+                    def build(project=project):
+                        return {
+                            'community': project.community,
+                            'address': project.address,
+                            'customer_name': project.customer_name,
+                            'sqft': project.sqft,
+                            'lots': f"Lot {project.lots}" if project.lots else "",
+                            'current_phase': project.current_phase,
+                            'completion_percentage': project.completion,
+                            'est_finish': project.est_finish,
+                            'schedule': project.schedule.to_json(),
+                            'is_duplex': False
+                        }
+                    
+                    yield single_key, digests[id(project)], build
         
-        # Process any remaining projects as singles (shouldn't be any if lot_pairs is complete)
-        for project in projects:
-            if id(project) not in processed_projects:
-                single_key = f"{project['community']}_{project['address']}".replace(' ', '_')
-                combined_data['projects'][single_key] = {
-                    'community': project['community'],
-                    'address': project['address'],
-                    'customer_name': project.get('customer_name', 'Unknown'),
-                    'sqft': project.get('sqft', ''),
-                    'lots': f"Lot {project.get('lots', '')}" if project.get('lots') else "",
-                    'current_phase': project.get('current_phase', 'Planning'),
-                    'completion_percentage': self._calculate_completion(project.get('schedule', [])),
-                    'schedule': project.get('schedule', []),
-                    'is_duplex': False
-                }
-        
-        # Update summary
-        combined_data['summary']['totalProjects'] = len(combined_data['projects'])
-        for project_data in combined_data['projects'].values():
-            phase = project_data['current_phase']
-            if phase not in combined_data['summary']['phases']:
-                combined_data['summary']['phases'][phase] = 0
-            combined_data['summary']['phases'][phase] += 1
-        
-        # Save individual view
-        json_path = self.public_path / 'schedule_data.json'
-        with open(json_path, 'w') as f:
-            json.dump(web_data, f, indent=2)
-        logging.info(f"Individual schedule data saved to {json_path}")
-        
-        # Save combined view
-        combined_json_path = self.public_path / 'schedule_data_combined.json'
-        with open(combined_json_path, 'w') as f:
-            json.dump(combined_data, f, indent=2)
-        logging.info(f"Combined schedule data saved to {combined_json_path}")
-        
-        # Copy to project filing system (G drive)
+        self._combined_cache.update(combined_entries())
+        logging.info(
+            f"Web data entries rebuilt: {self._web_cache.stats['rebuilt']} individual / "
+            f"{self._combined_cache.stats['rebuilt']} combined (cumulative, "
+            f"{self._web_cache.stats['reused'] + self._combined_cache.stats['reused']} reused)"
+        )
+        
+        # Serialize every file once; all destinations are written from these bytes
+        combined_document = self._combined_cache.document(last_updated, len(self._combined_cache))
+        shards = shard_outputs(combined_document, self.phase_counts)
+        if feed is not None:
+            feed.update(combined_document)
+        if CONFIG['COMBINED_FORMAT'] == 2:
+            combined_document = encode_combined(combined_document)
+            combined_text = json.dumps(combined_document, separators=(',', ':'))
+        else:
+            combined_text = self._combined_cache.render(last_updated, len(self._combined_cache))
+        
+        outputs = {
+            'schedule_data.json': self._web_cache.render(last_updated, len(projects)).encode('utf-8'),
+            'schedule_data_combined.json': combined_text.encode('utf-8'),
+        }
+        # Minified / gzip / brotli variants for hosts that can serve them
+        outputs.update(variant_outputs('schedule_data.json', self._web_cache.document(last_updated, len(projects))))
+        outputs.update(variant_outputs('schedule_data_combined.json', combined_document))
+        # Per-project / per-community shards and their manifest (written last)
+        outputs.update(shards)
+        if feed is not None:
+            outputs.update(feed.outputs())
+        return outputs
+    
+    def generate_web_data(self, projects, copy_outputs=True, output_dir=None):
+        """Generate data for web display - both individual and combined views
+        
+        Returns the paths written; the copies to the sync folders are skipped
+        when copy_outputs is False. output_dir overrides the public folder
+        (batch backfills).
+        """
+        feed = None if output_dir else self.delta_feed
+        output_dir = Path(output_dir) if output_dir else self.public_path
+        outputs = self.build_web_outputs(projects, feed)
+        self._write_public_outputs(output_dir, outputs)
+        
+        if copy_outputs:
+            for destination, label in self._copy_destinations():
+                self._publish_outputs(destination, outputs, label, output_dir)
+        
+        return [output_dir / name for name, data in outputs.items() if data is not None]
+    
+    def _write_public_outputs(self, output_dir, outputs):
+        """Write the generated files to the public folder
+        
+        Returns:
+            dict: publish_files result per file (what changed, e.g. for the GitHub uploader)
+        """
+        results = publish_files(outputs, output_dir, prune=(SHARD_DIR, DELTA_DIR))
+        logging.info(f"Individual schedule data saved to {output_dir / 'schedule_data.json'}")
+        logging.info(f"Combined schedule data saved to {output_dir / 'schedule_data_combined.json'}")
+        return results
+    
+    def _copy_destinations(self):
+        """Sync folders that receive a copy of the generated JSON files"""
+        return [
+            # Project filing system (G drive)
+            (Path("G:/My Drive/Project Dashboard/Schedule System"), "project filing system (G drive)"),
+            # Dropbox folder (dynamic user path)
+            (Path.home() / 'Ambience Team Dropbox' / 'Onedrive files' / 'UNDER CONSTRUCTION' / 'NEW STUFF' / 'Master Schedules' / 'JsonScheduleData',
+             "Dropbox folder (dynamic user path)"),
+        ]
+    
+    def _publish_outputs(self, destination, outputs, label, source_dir=None):
+        """Write the generated files to one sync folder, skipping unchanged ones
+        
+        Returns:
+            bool: True if the folder is up to date, False if publishing failed
+        """
         try:
-            project_filing_path = Path("G:/My Drive/Project Dashboard/Schedule System")
-            project_filing_path.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(json_path, project_filing_path / 'schedule_data.json')
-            shutil.copy2(combined_json_path, project_filing_path / 'schedule_data_combined.json')
-            logging.info("Copied both JSON files to project filing system (G drive)")
+            results = publish_files(outputs, destination, source_dir=source_dir or self.public_path,
+                                    prune=(SHARD_DIR, DELTA_DIR))
+            changed = sum(1 for result in results.values() if result != 'unchanged')
+            linked = sum(1 for result in results.values() if result == 'linked')
+            total = sum(1 for data in outputs.values() if data is not None)
+            logging.info(
+                f"Published {changed} of {total} JSON files to {label}"
+                + (f" ({linked} hardlinked)" if linked else "")
+            )
+            return True
         except Exception as e:
-            logging.error(f"Failed to copy to project filing system (G drive): {e}")
+            logging.error(f"Failed to publish to {label}: {e}")
+            return False
+
+# Per-process automation used by batch worker processes
+_batch_automation = None
+
+
+def _init_batch_worker(workbook):
+    """Worker initializer - reuse the workbook data loaded by the parent"""
+    global _batch_automation
+    _batch_automation = EnhancedScheduleAutomation(customer_data=workbook.customers, partner_data=workbook.contacts)
+
+
+def _process_batch_export(job):
+    export_path, output_dir = job
+    return _batch_automation.process_export_file(export_path, output_dir)
+
+
+def _seconds_until_refresh():
+    """Time until the dashboards are due for a re-render: just past local midnight
+    (current phase, completion % and est. finish depend on the date), or
+    CONFIG['REFRESH_SECONDS'] if that is sooner"""
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    seconds = (midnight - now).total_seconds() + 1
+    if CONFIG['REFRESH_SECONDS'] > 0:
+        seconds = min(seconds, CONFIG['REFRESH_SECONDS'])
+    return seconds
 
-        # Copy to Dropbox folder (dynamic user path)
-        try:
-            home = Path.home()
-            dropbox_path = home / 'Ambience Team Dropbox' / 'Onedrive files' / 'UNDER CONSTRUCTION' / 'NEW STUFF' / 'Master Schedules' / 'JsonScheduleData'
-            dropbox_path.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(json_path, dropbox_path / 'schedule_data.json')
-            shutil.copy2(combined_json_path, dropbox_path / 'schedule_data_combined.json')
-            logging.info("Copied both JSON files to Dropbox folder (dynamic user path)")
-        except Exception as e:
-            logging.error(f"Failed to copy to Dropbox folder (dynamic user path): {e}")
 
-def main():
-    """Run the automation with monitoring"""
+def main(argv=None):
+    """Run the automation, reacting to VBA export events"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Master Schedule automation")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--once', action='store_true',
+                      help="process the current export and queued triggers, then exit")
+    mode.add_argument('--batch', metavar='DIR',
+                      help="process every *.json export in DIR (e.g. a backlog or the Archive folder) and exit")
+    parser.add_argument('--output', metavar='DIR',
+                        help="output folder for --batch (default: DIR/web_data)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for --batch (default: 1)")
+    args = parser.parse_args(argv)
+    
     automation = EnhancedScheduleAutomation()
     
-    # For production - monitor for triggers
-    logging.info("Monitoring for trigger files...")
+    if args.batch:
+        automation.process_batch(args.batch, args.output, args.workers)
+        return
     
-    while True:
-        try:
-            projects = automation.parse_schedule_data()
-            if projects:
-                automation.generate_web_data(projects)
-                logging.info("Web data generated and saved.")
-                time.sleep(60)  # Wait a bit longer after processing
+    # Pick up anything exported (or queued) while we were not running
+    automation.process_pending(wait=args.once)
+    if args.once:
+        return
+    
+    watcher = TriggerWatcher(automation.temp_path, ['schedule_data.json', 'trigger.txt'])
+    automation.start_workbook_reloader()
+    logging.info(f"Watching {automation.temp_path} for exports ({watcher.backend})...")
+    
+    try:
+        while True:
+            refresh = _seconds_until_refresh()
+            # A settling trigger burst is processed as soon as it settles
+            settling = automation.trigger_wait()
+            if settling and settling < refresh:
+                changed = watcher.wait(timeout=settling)
             else:
-                logging.info("No projects found. Retrying soon.")
-                time.sleep(30)  # Check again soon if nothing to process
-        except KeyboardInterrupt:
-            logging.info("Automation stopped by user")
-            break
-        except Exception as e:
-            logging.error(f"Unexpected error: {e}")
-            time.sleep(60)
+                settling = None
+                changed = watcher.wait(timeout=refresh)
+            if changed:
+                logging.info(f"Export activity detected: {', '.join(sorted(changed))}")
+            elif settling:
+                logging.info("Export burst settled - processing queued triggers")
+            else:
+                # The date is part of the input fingerprint, so this run is not skipped after midnight
+                logging.info("Refreshing date-dependent schedule data...")
+            try:
+                automation.process_pending()
+            except Exception as e:
+                logging.error(f"Unexpected error: {e}")
+    except KeyboardInterrupt:
+        logging.info("Automation stopped by user")
+    finally:
+        automation.stop_workbook_reloader()
+        watcher.close()
 
 if __name__ == "__main__":
-    # For testing, run once
-    # automation = EnhancedScheduleAutomation()
-    # automation.run()
+    # For testing, run once:       python schedule_automation_enhanced.py --once
+    # For backfills:               python schedule_automation_enhanced.py --batch <folder> --workers 4
     
     # For production, run monitoring loop
-    main()
\ No newline at end of file
+    main()
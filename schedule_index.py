@@ -0,0 +1,150 @@
+# schedule_index.py
+"""
+Sorted timeline of every task in an export
+Answers "what is on site on day X" and "what happens between X and Y"
+with a binary search plus the matching tasks (O(log n + k)) instead of
+walking every project's schedule. Per-project timelines are sorted on first
+use, so one project's window ("last week / next two weeks") is a bisect too.
+
+An inverted index from task name (the trade's work: 'LVP', 'Paint',
+'C-Tops/B-Splsh', ...) to that task's own sorted timeline answers trade
+lookaheads ("all Paint work in the next 14 days") the same way.
+
+Query bounds may be day ordinals, date / datetime objects or ISO strings;
+None leaves that end of a range open.
+"""
+
+from heapq import merge
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from date_ordinals import NO_DATE, date_ordinal, ordinal_text
+
+
+class ScheduledTask:
+    """One task of one project, as returned by the index"""
+
+    __slots__ = ('ordinal', 'project', 'index')
+
+    def __init__(self, ordinal, project, index):
+        self.ordinal = ordinal
+        self.project = project
+        self.index = index      # position in project.schedule
+
+    @property
+    def date(self):
+        return ordinal_text(self.ordinal)
+
+    @property
+    def task(self):
+        return self.project.schedule.task(self.index)
+
+    @property
+    def phase(self):
+        return self.project.schedule.phase(self.index)
+
+    def __repr__(self):
+        return f"ScheduledTask({self.date}, {self.project.address!r}, {self.task!r})"
+
+
+def _ordinal(value):
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str):
+        ordinal = date_ordinal(value)
+        if ordinal == NO_DATE:
+            raise ValueError(f"Not an ISO date: {value!r}")
+        return ordinal
+    return value
+
+
+def _window(ordinals, start, end):
+    """Slice bounds of the sorted `ordinals` that fall within [start, end]"""
+    low = 0 if start is None else bisect_left(ordinals, _ordinal(start))
+    high = len(ordinals) if end is None else bisect_right(ordinals, _ordinal(end))
+    return low, max(low, high)
+
+
+class ScheduleIndex:
+    """Task timeline of a list of projects (tasks without a valid date are left out)"""
+
+    def __init__(self, projects=()):
+        self.projects = list(projects)
+
+        rows = sorted(
+            (ordinal, position, index)
+            for position, project in enumerate(self.projects)
+            for index, ordinal in enumerate(project.schedule.dates)
+            if ordinal != NO_DATE
+        )
+        self._ordinals = [row[0] for row in rows]
+        self._rows = rows
+        self._project_timelines = {}
+
+        # task name -> (ordinals, rows), each still sorted by date then project
+        self._by_task = {}
+        for row in rows:
+            ordinal, position, index = row
+            task = self.projects[position].schedule.task(index)
+            timeline = self._by_task.get(task)
+            if timeline is None:
+                timeline = self._by_task[task] = ([], [])
+            timeline[0].append(ordinal)
+            timeline[1].append(row)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _tasks(self, rows):
+        projects = self.projects
+        return [ScheduledTask(ordinal, projects[position], index) for ordinal, position, index in rows]
+
+    def on(self, day):
+        """Tasks scheduled on one day, in project order"""
+        return self.between(day, day)
+
+    def between(self, start=None, end=None):
+        """Tasks dated start..end (inclusive), by date then project order"""
+        low, high = _window(self._ordinals, start, end)
+        return self._tasks(self._rows[low:high])
+
+    def task_names(self):
+        """Names of all tasks that have at least one dated occurrence, sorted"""
+        return sorted(self._by_task, key=str)
+
+    def for_task(self, task, start=None, end=None):
+        """
+        Occurrences of one task (or of several, e.g. a trade's task names)
+        dated start..end (inclusive), by date then project order
+        """
+        names = [task] if isinstance(task, str) else task
+        slices = []
+        for name in names:
+            timeline = self._by_task.get(name)
+            if timeline is not None:
+                low, high = _window(timeline[0], start, end)
+                slices.append(timeline[1][low:high])
+        rows = slices[0] if len(slices) == 1 else list(merge(*slices))
+        return self._tasks(rows)
+
+    def _project_timeline(self, project):
+        timeline = self._project_timelines.get(id(project))
+        if timeline is None or timeline[0] is not project:
+            dates = project.schedule.dates
+            indices = sorted((index for index, ordinal in enumerate(dates) if ordinal != NO_DATE),
+                             key=dates.__getitem__)
+            timeline = (project, [dates[index] for index in indices], indices)
+            self._project_timelines[id(project)] = timeline
+        return timeline
+
+    def project_tasks(self, project, start=None, end=None):
+        """
+        One project's tasks dated start..end (inclusive)
+
+        Works for any project, indexed or not. Tasks come back in schedule
+        order, which is how the emails list them.
+        """
+        _, ordinals, indices = self._project_timeline(project)
+        low, high = _window(ordinals, start, end)
+        return [ScheduledTask(project.schedule.dates[index], project, index)
+                for index in sorted(indices[low:high])]
@@ -0,0 +1,234 @@
+# schedule_model.py
+"""
+In-memory model for exported projects
+A Project keeps its fields in __slots__ and its schedule as parallel arrays
+(date ordinals, interned task ids, phase codes) instead of a list of small
+dicts, so walking every schedule is a pass over integers. to_json() /
+from_json() convert to and from the VBA export shape at the boundaries
+(web data, saved project files). Dates go through the memoized parser in
+date_ordinals, so each distinct date string is parsed once per process.
+"""
+
+import hashlib
+from array import array
+
+from date_ordinals import NO_DATE, date_ordinal, ordinal_text
+
+
+class Interner:
+    """Two-way table between strings and small integer codes"""
+
+    __slots__ = ('names', 'codes')
+
+    def __init__(self):
+        self.names = []
+        self.codes = {}
+
+    def code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def name(self, code):
+        return self.names[code]
+
+    def compact(self, arrays):
+        """
+        Renumber to the names used by `arrays` only (remapped in place),
+        dropping every other name; codes held anywhere else become invalid
+        """
+        names = []
+        remap = {}
+        for codes in arrays:
+            for position, code in enumerate(codes):
+                new = remap.get(code)
+                if new is None:
+                    new = remap[code] = len(names)
+                    names.append(self.names[code])
+                codes[position] = new
+        self.names = names
+        self.codes = {name: code for code, name in enumerate(names)}
+
+
+TASKS = Interner()
+PHASES = Interner()
+
+# A long-running process sees new task / phase spellings with every export;
+# past this many names the tables are compacted (see compact_tables)
+COMPACT_ABOVE = 4096
+
+# Key tuples are shared between projects (every project of an export has the same keys)
+_KEY_ORDERS = {}
+
+
+class Schedule:
+    """One project's tasks as parallel arrays"""
+
+    __slots__ = ('dates', 'tasks', 'phases', 'extras')
+
+    def __init__(self):
+        self.dates = array('l')
+        self.tasks = array('I')
+        self.phases = array('I')
+        # index -> original item, for items that do not fit the
+        # {'date', 'task', 'phase'} shape (kept verbatim for to_json)
+        self.extras = {}
+
+    @classmethod
+    def from_json(cls, items):
+        schedule = cls()
+        for index, item in enumerate(items):
+            ordinal = date_ordinal(item.get('date'))
+            task = item.get('task')
+            phase = item.get('phase', 'other')
+            schedule.dates.append(ordinal)
+            schedule.tasks.append(TASKS.code(task))
+            schedule.phases.append(PHASES.code(phase))
+            if ordinal == NO_DATE or list(item) != ['date', 'task', 'phase']:
+                schedule.extras[index] = item
+        return schedule
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __bool__(self):
+        return len(self.dates) > 0
+
+    def date_text(self, index):
+        """The date as it appeared in the export"""
+        extra = self.extras.get(index)
+        if extra is not None:
+            return extra.get('date')
+        return ordinal_text(self.dates[index])
+
+    def task(self, index):
+        return TASKS.names[self.tasks[index]]
+
+    def phase(self, index):
+        return PHASES.names[self.phases[index]]
+
+    def rows(self):
+        """Yield (ordinal, date text, task, phase) per task, in schedule order"""
+        task_names = TASKS.names
+        phase_names = PHASES.names
+        for index, ordinal in enumerate(self.dates):
+            yield ordinal, self.date_text(index), task_names[self.tasks[index]], phase_names[self.phases[index]]
+
+    def last_date(self):
+        """Latest valid date ordinal, NO_DATE if there is none"""
+        return max(self.dates, default=NO_DATE)
+
+    def to_json(self):
+        task_names = TASKS.names
+        phase_names = PHASES.names
+        extras = self.extras
+        return [
+            extras[index] if index in extras else {
+                'date': ordinal_text(ordinal),
+                'task': task_names[self.tasks[index]],
+                'phase': phase_names[self.phases[index]]
+            }
+            for index, ordinal in enumerate(self.dates)
+        ]
+
+    def digest(self):
+        """Content hash of the schedule (valid within one process and until the
+        tables are compacted - codes are interned)"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.dates.tobytes())
+        h.update(self.tasks.tobytes())
+        h.update(self.phases.tobytes())
+        if self.extras:
+            h.update(repr(sorted(self.extras.items())).encode('utf-8'))
+        return h.hexdigest()
+
+
+class Project:
+    """One exported project (a house / duplex unit)"""
+
+    FIELDS = ('project_id', 'community', 'address', 'lots', 'sqft',
+              'current_phase', 'customer_name', 'customer_email')
+    # Added by enrichment when the export does not carry them
+    ENRICHED = ('current_phase', 'customer_name', 'customer_email')
+
+    # completion / est_finish are set by the rollups (see schedule_rollups); to_json() leaves them out
+    __slots__ = FIELDS + ('schedule', 'extra', 'key_order', 'completion', 'est_finish')
+
+    def __init__(self, community='', address='', lots='', sqft='', project_id=None,
+                 current_phase=None, customer_name=None, customer_email=None,
+                 schedule=None, extra=None, key_order=()):
+        self.project_id = project_id
+        self.community = community
+        self.address = address
+        self.lots = lots
+        self.sqft = sqft
+        self.current_phase = current_phase
+        self.customer_name = customer_name
+        self.customer_email = customer_email
+        self.schedule = schedule if schedule is not None else Schedule()
+        self.extra = extra or {}
+        self.key_order = key_order
+        self.completion = None
+        self.est_finish = None
+
+    @classmethod
+    def from_json(cls, data):
+        """Build a Project from an export entry (dict)"""
+        key_order = tuple(data)
+        key_order = _KEY_ORDERS.setdefault(key_order, key_order)
+
+        project = cls(
+            community=data.get('community', ''),
+            address=data.get('address', ''),
+            lots=data.get('lots', ''),
+            sqft=data.get('sqft', ''),
+            project_id=data.get('project_id'),
+            current_phase=data.get('current_phase'),
+            customer_name=data.get('customer_name'),
+            customer_email=data.get('customer_email'),
+            schedule=Schedule.from_json(data.get('schedule') or []),
+            key_order=key_order
+        )
+        for key, value in data.items():
+            if key not in cls.FIELDS and key != 'schedule':
+                project.extra[key] = value
+        return project
+
+    def to_json(self):
+        """The export entry as a dict (original key order, enriched fields appended)"""
+        data = {}
+        for key in self.key_order:
+            if key == 'schedule':
+                data[key] = self.schedule.to_json()
+            elif key in self.FIELDS:
+                data[key] = getattr(self, key)
+            else:
+                data[key] = self.extra[key]
+        for key in self.ENRICHED:
+            if key not in data and getattr(self, key) is not None:
+                data[key] = getattr(self, key)
+        return data
+
+    def digest_parts(self):
+        """Everything the generated outputs depend on, in a cheap hashable form"""
+        return [[getattr(self, field) for field in self.FIELDS], self.extra, self.schedule.digest()]
+
+
+def compact_tables(schedules, limit=COMPACT_ABOVE):
+    """
+    Drop interned names no longer in use once a table has grown past `limit`
+
+    `schedules` must be every schedule still in use (the current export);
+    their codes are renumbered in place, any other schedule is invalidated.
+
+    Returns:
+        bool: True if the tables were compacted
+    """
+    if len(TASKS.names) <= limit and len(PHASES.names) <= limit:
+        return False
+    schedules = list(schedules)
+    TASKS.compact([schedule.tasks for schedule in schedules])
+    PHASES.compact([schedule.phases for schedule in schedules])
+    return True
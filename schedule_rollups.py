@@ -0,0 +1,109 @@
+# schedule_rollups.py
+"""
+Vectorized per-project rollups of an export
+All schedules are laid out as one long task table (project index, date
+ordinal, phase code - taken straight from the Schedule arrays) and current
+phase, completion % and est_finish are computed for every project in one
+pass of numpy group operations, together with the community / phase counts.
+
+numpy is imported on first use so the automation still starts quickly.
+"""
+
+from date_ordinals import NO_DATE, today_ordinal
+from schedule_model import PHASES
+
+# Phase of a project with no task dated today or earlier
+DEFAULT_PHASE = 'Planning'
+
+
+def task_table(projects):
+    """
+    One row per task, projects in order
+
+    Returns:
+        tuple: (project index, date ordinal, phase code) numpy arrays, and the
+               number of tasks per project
+    """
+    import numpy as np
+
+    schedules = [project.schedule for project in projects]
+    lengths = np.fromiter((len(schedule) for schedule in schedules), dtype=np.intp, count=len(schedules))
+    project_index = np.repeat(np.arange(len(schedules)), lengths)
+    # array('l') / array('I') expose their buffers, so this copies raw integers only
+    dates = np.concatenate([np.frombuffer(schedule.dates, dtype=schedule.dates.typecode) for schedule in schedules])
+    phases = np.concatenate([np.frombuffer(schedule.phases, dtype=schedule.phases.typecode) for schedule in schedules])
+    return project_index, dates, phases, lengths
+
+
+def _group_ends(groups):
+    """Positions of the last row of each run of equal (sorted) group ids"""
+    import numpy as np
+    return np.flatnonzero(np.append(groups[1:] != groups[:-1], True))
+
+
+def compute_rollups(projects, today=None):
+    """
+    Current phase, completion % and est_finish of every project
+
+    Args:
+        projects: Project objects
+        today: Day ordinal to evaluate against (defaults to today)
+
+    Returns:
+        dict: 'current_phase', 'completion' and 'est_finish' (day ordinal,
+              NO_DATE without dates) lists in project order, and 'summary'
+              {community: {phase: number of projects}}
+    """
+    if not projects:
+        return {'current_phase': [], 'completion': [], 'est_finish': [], 'summary': {}}
+
+    import numpy as np
+
+    today = today_ordinal() if today is None else today
+    count = len(projects)
+    project_index, dates, phases, lengths = task_table(projects)
+
+    valid = dates != NO_DATE
+    done = valid & (dates <= today)
+
+    # Completion: tasks dated today or earlier per project
+    done_index = project_index[done]
+    completed = np.bincount(done_index, minlength=count)
+
+    # Current phase: phase of the last such task in schedule order
+    # (rows are grouped by project, so the last row of each group wins)
+    last_phase = np.full(count, -1, dtype=np.int64)
+    if done_index.size:
+        ends = _group_ends(done_index)
+        last_phase[done_index[ends]] = phases[done][ends]
+
+    # est_finish: latest valid date per project
+    est_finish = np.full(count, NO_DATE, dtype=dates.dtype)
+    valid_index = project_index[valid]
+    if valid_index.size:
+        starts = np.flatnonzero(np.insert(valid_index[1:] != valid_index[:-1], 0, True))
+        est_finish[valid_index[starts]] = np.maximum.reduceat(dates[valid], starts)
+
+    phase_names = PHASES.names
+    current_phase = [phase_names[code] if code >= 0 else DEFAULT_PHASE for code in last_phase.tolist()]
+    completion = [
+        round((done_count / total) * 100, 1) if total else 0
+        for done_count, total in zip(completed.tolist(), lengths.tolist())
+    ]
+
+    # Community / phase counts: group on the (community, phase) pair codes
+    communities, community_codes = np.unique(
+        np.array([project.community.strip() for project in projects], dtype=object), return_inverse=True)
+    phase_labels, phase_codes = np.unique(np.array(current_phase, dtype=object), return_inverse=True)
+    pairs, pair_counts = np.unique(community_codes * len(phase_labels) + phase_codes, return_counts=True)
+    summary = {}
+    for pair, pair_count in zip(pairs.tolist(), pair_counts.tolist()):
+        community, phase = divmod(pair, len(phase_labels))
+        summary.setdefault(communities[community], {})[phase_labels[phase]] = pair_count
+
+    return {
+        'current_phase': current_phase,
+        'completion': completion,
+        'est_finish': est_finish.tolist(),
+        'summary': summary
+    }
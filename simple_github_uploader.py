@@ -3,11 +3,19 @@
 
 import requests
 import base64
+import hashlib
 import json
 import os
 import logging
 from datetime import datetime
 from pathlib import Path
+from output_variants import smallest_variant
+from data_shards import SHARD_DIR, MANIFEST_NAME
+from delta_feed import DELTA_DIR
+
+def git_blob_sha(content):
+    """SHA GitHub reports for a file with this content (bytes)"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
 
 class SimpleGitHubUploader:
     """Simple class to upload JSON files to GitHub Pages"""
@@ -77,6 +85,9 @@ class SimpleGitHubUploader:
             if response.status_code == 200:
                 # File exists, include SHA for update
                 data["sha"] = response.json()['sha']
+                if data["sha"] == git_blob_sha(content.encode()):
+                    logging.info(f"Unchanged, not uploading: {remote_file_path}")
+                    return True
                 logging.info(f"Updating existing file: {remote_file_path}")
             else:
                 logging.info(f"Creating new file: {remote_file_path}")
@@ -97,30 +108,58 @@ class SimpleGitHubUploader:
             logging.error(f"❌ Error uploading {remote_file_path}: {e}")
             return False
     
-    def upload_schedule_data(self, json_file_path):
+    def upload_schedule_data(self, json_file_path, published=None):
         """
         Upload schedule data files to GitHub
         
         Args:
             json_file_path: Path to the schedule_data_combined.json file
+            published: Result of publish_files for this run (file name -> 'written',
+                       'linked', 'unchanged', ...). Only files it reports as written
+                       are uploaded, so a run costs API calls for what changed, not
+                       for every shard and delta file. None uploads every file.
         """
         if not self.enabled:
             return False
         
         success = True
+        json_file_path = Path(json_file_path)
+        root = json_file_path.parent
         
-        # Upload the combined data file
-        if self.upload_file(json_file_path, 'schedule_data_combined.json'):
-            logging.info("✅ Combined schedule data uploaded successfully")
-        else:
-            success = False
+        def changed(*paths):
+            if published is None:
+                return True
+            return any(published.get(Path(path).relative_to(root).as_posix()) in ('written', 'linked')
+                       for path in paths)
+        
+        # Upload the combined data file (minified variant when available -
+        # GitHub Pages compresses on its own, so only plain JSON is served)
+        combined_path, _ = smallest_variant(json_file_path)
+        if changed(json_file_path, combined_path):
+            if self.upload_file(combined_path, 'schedule_data_combined.json'):
+                logging.info("✅ Combined schedule data uploaded successfully")
+            else:
+                success = False
         
         # Also upload individual data if it exists
         individual_path = json_file_path.parent / 'schedule_data.json'
         if individual_path.exists():
-            if self.upload_file(individual_path, 'schedule_data.json'):
-                logging.info("✅ Individual schedule data uploaded successfully")
-            else:
+            variant_path, _ = smallest_variant(individual_path)
+            if changed(individual_path, variant_path):
+                if self.upload_file(variant_path, 'schedule_data.json'):
+                    logging.info("✅ Individual schedule data uploaded successfully")
+                else:
+                    success = False
+        
+        # Shards and the delta feed for the dashboards' manifest / feed modes.
+        # The index files go last so they never point at a file not uploaded yet
+        index_names = [f"{DELTA_DIR}/index.json", MANIFEST_NAME]
+        data_files = [
+            path for folder in (SHARD_DIR, DELTA_DIR) for path in sorted((root / folder).rglob('*.json'))
+            if path.relative_to(root).as_posix() not in index_names
+        ]
+        for path in data_files + [root / name for name in index_names if (root / name).exists()]:
+            if changed(path) and not self.upload_file(path, path.relative_to(root).as_posix()):
                 success = False
         
         return success
@@ -130,18 +169,19 @@ def setup_github_uploader():
     """Setup GitHub uploader with environment variables"""
     return SimpleGitHubUploader()
 
-def upload_to_github(json_file_path):
-    """Simple function to upload schedule data to GitHub"""
+def upload_to_github(json_file_path, published=None):
+    """Simple function to upload schedule data to GitHub (see upload_schedule_data)"""
     uploader = setup_github_uploader()
-    return uploader.upload_schedule_data(json_file_path)
+    return uploader.upload_schedule_data(json_file_path, published)
 
 # Integration example for your existing automation
 def integrate_with_automation():
     """
     Add this to your schedule_automation_enhanced.py generate_web_data method:
     
-    # After saving the JSON files locally, add:
-    if upload_to_github(combined_json_path):
+    # After saving the JSON files locally (published = what publish_files
+    # returned for the public folder, see _write_public_outputs), add:
+    if upload_to_github(combined_json_path, published):
         print("✅ Data uploaded to GitHub Pages successfully!")
         print(f"📊 Dashboard URL: https://{os.getenv('GITHUB_USERNAME')}.github.io/{os.getenv('GITHUB_REPO', 'schedule-data')}/")
     else:
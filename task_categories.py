@@ -0,0 +1,114 @@
+# task_categories.py
+"""
+Shared task -> construction phase categorizer
+The keyword table is compiled into one regular expression; a task belongs to
+the first phase (in table order) that has a keyword anywhere in its name,
+exactly like checking each phase's keywords in turn. Results are memoized
+per distinct task string (the same few dozen task names repeat in every
+schedule), with hit / miss counters.
+
+Used by pdf_table_parser and schedule_automation_enhanced. The VBA export
+categorizes with its own CategorizeTask; EXPORT_PHASE_KEYWORDS is that
+table, used where Python reproduces the export (workbook_grid).
+"""
+
+import re
+from functools import lru_cache
+
+# Phase -> keywords, in priority order
+PHASE_KEYWORDS = {
+    'foundation': ['foundation', 'concrete', 'slab', 'footing', 'foundy', 'pour slab', 'pour foundy'],
+    'framing': ['frame', 'framing', 'lumber', 'walls', 'nailing'],
+    'roofing': ['roof', 'shingle', 'roofing'],
+    'electrical': ['electrical', 'elec', 'wire', 'electric'],
+    'plumbing': ['plumb', 'pipe', 'water', 'finish plumbing'],
+    'hvac': ['hvac', 'heat', 'air', 'duct'],
+    'insulation': ['insulation', 'insulate'],
+    'drywall': ['drywall', 'sheetrock', 'hang', 'tape', 'texture', 'double', 'flush', 'pva'],
+    'flooring': ['floor', 'lvp', 'carpet', 'tile'],
+    'painting': ['paint', 'primer'],
+    'cabinets': ['cabinet', 'c-tops', 'b-splsh', 'countertop', 'cabinet install'],
+    'finishing': ['finish', 'trim', 'detail', 'cleaning'],
+    'inspection': ['inspection', 'final inspection', 'insp'],
+    'move': ['move', 'clean/move']
+}
+
+# CategorizeTask of Enhanced_Export_Master_Schedule.bas, case for case
+EXPORT_PHASE_KEYWORDS = {
+    'foundation': ['foundation', 'slab', 'concrete'],
+    'framing': ['fram'],
+    'roofing': ['roof'],
+    'electrical': ['elec'],
+    'plumbing': ['plumb'],
+    'hvac': ['hvac'],
+    'insulation': ['insulat'],
+    'drywall': ['drywall', 'tape', 'texture'],
+    'painting': ['paint', 'pva'],
+    'flooring': ['floor', 'carpet', 'lvp'],
+    'cabinets': ['cabinet', 'c-tops'],
+    'move': ['clean', 'move'],
+    'inspection': ['inspect'],
+    'finishing': ['detail', 'finish', 'trim']
+}
+
+DEFAULT_PHASE = 'other'
+
+
+class TaskCategorizer:
+    """Compiled, memoized version of a phase keyword table"""
+
+    def __init__(self, phase_keywords=PHASE_KEYWORDS, default=DEFAULT_PHASE, cache_size=4096):
+        """
+        Args:
+            phase_keywords: Ordered dict of phase -> keywords (lower case)
+            default: Phase of a task that matches no keyword
+            cache_size: Number of distinct task strings remembered
+        """
+        self.default = default
+        self.phases = list(phase_keywords)
+
+        # keyword -> priority of the first phase that lists it
+        self._priority = {}
+        for priority, keywords in enumerate(phase_keywords.values()):
+            for keyword in keywords:
+                self._priority.setdefault(keyword.lower(), priority)
+
+        # The lookahead tries every position; at each one the alternatives are
+        # ordered by priority, so the best keyword starting there is reported
+        # even when others overlap it
+        keywords = sorted(self._priority, key=self._priority.get)
+        self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))') if keywords else None
+
+        self._cached = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, task_lower):
+        best = None
+        if self._pattern is not None:
+            for match in self._pattern.finditer(task_lower):
+                priority = self._priority[match.group(1)]
+                if best is None or priority < best:
+                    best = priority
+                    if best == 0:
+                        break
+        return self.default if best is None else self.phases[best]
+
+    def categorize(self, task):
+        """Construction phase of a task name"""
+        return self._cached(task.lower())
+
+    def cache_info(self):
+        """Memo cache statistics (hits, misses, maxsize, currsize)"""
+        return self._cached.cache_info()
+
+
+_default = TaskCategorizer()
+
+
+def categorize_task(task):
+    """Construction phase of a task name (shared default table)"""
+    return _default.categorize(task)
+
+
+def cache_info():
+    """Hit / miss statistics of the shared categorizer"""
+    return _default.cache_info()
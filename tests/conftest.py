@@ -0,0 +1,30 @@
+# conftest.py
+"""
+Shared fixtures (python -m pytest tests)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import schedule_automation_enhanced as automation_module
+from schedule_automation_enhanced import EnhancedScheduleAutomation
+
+
+@pytest.fixture
+def automation(tmp_path, monkeypatch):
+    """EnhancedScheduleAutomation working in tmp_path, with no workbook data"""
+    # Skip init(): no .env, no log folder outside tmp_path
+    monkeypatch.setattr(automation_module, '_initialized', True)
+    monkeypatch.setitem(automation_module.CONFIG, 'BASE_PATH', str(tmp_path))
+    # Claim each trigger as soon as it is queued (see test_trigger_burst_is_one_run)
+    monkeypatch.setitem(automation_module.CONFIG, 'TRIGGER_SETTLE_SECONDS', 0)
+    automation = EnhancedScheduleAutomation(customer_data={}, partner_data=[])
+    # Never copy to the real G: drive / Dropbox folders
+    monkeypatch.setattr(automation, '_copy_destinations', lambda: [])
+    automation.temp_path.mkdir(parents=True)
+    yield automation
+    automation.trigger_queue.close()
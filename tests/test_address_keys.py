@@ -0,0 +1,39 @@
+# test_address_keys.py
+"""
+Address lookups tolerate spelling differences but never pick another house
+(python -m pytest tests)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from address_keys import AddressIndex
+
+CUSTOMERS = {
+    '346 Stockton Ct': 'stockton court',
+    '4744 W. Quinault Pl': 'quinault',
+    '10 Main St': 'main street',
+    '10 Main Ave': 'main avenue',
+}
+
+
+def test_spelling_differences_match():
+    index = AddressIndex(CUSTOMERS)
+    assert index.get('4744 W Quinault') == 'quinault'
+    assert index.get('4744 west quinault place') == 'quinault'
+    assert index.get('346 Stockton Court') == 'stockton court'
+    assert index.get('10 Main Street') == 'main street'
+
+
+def test_different_street_does_not_match():
+    index = AddressIndex(CUSTOMERS)
+    assert index.get('346 Stockton St') is None
+    assert index.get('4744 E Quinault') is None
+    assert index.get('4744 W Quinalt') is None
+
+
+def test_ambiguous_address_does_not_match():
+    index = AddressIndex(CUSTOMERS)
+    assert index.get('10 Main') is None
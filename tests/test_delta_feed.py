@@ -0,0 +1,38 @@
+# test_delta_feed.py
+"""
+Applying the patches must give the same document, key order included, as
+loading the snapshot
+(python -m pytest tests)
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from delta_feed import diff, apply_patch
+
+
+def patched(old, new):
+    return apply_patch(copy.deepcopy(old), diff(old, new))
+
+
+def test_added_project_keeps_its_position():
+    old = {'projects': {'Canal_1': {'lots': '1'}, 'Canal_3': {'lots': '3'}}}
+    new = {'projects': {'Canal_1': {'lots': '1'}, 'Canal_2': {'lots': '2'}, 'Canal_3': {'lots': '3'}}}
+    assert json.dumps(patched(old, new)) == json.dumps(new)
+
+
+def test_reordered_keys_are_a_change():
+    old = {'projects': {'Canal_1': {'lots': '1', 'sqft': '1850'}}}
+    new = {'projects': {'Canal_1': {'sqft': '1850', 'lots': '1'}}}
+    assert diff(old, new)
+    assert json.dumps(patched(old, new)) == json.dumps(new)
+
+
+def test_appended_key_is_a_plain_add():
+    old = {'projects': {'Canal_1': {'lots': '1'}}}
+    new = {'projects': {'Canal_1': {'lots': '1'}, 'Canal_2': {'lots': '2'}}}
+    assert diff(old, new) == [{'op': 'add', 'path': '/projects/Canal_2', 'value': {'lots': '2'}}]
@@ -0,0 +1,49 @@
+# test_input_fingerprint.py
+"""
+A run is skipped as unchanged only if it would render exactly what was
+published last time: same export, same workbook data, same lot pairs
+(python -m pytest tests)
+"""
+
+from pathlib import Path
+
+from lot_pairs import LotPairRegistry
+from workbook_loader import WorkbookSnapshot
+
+SAMPLE_EXPORT = Path(__file__).resolve().parent.parent / "schedule_data.json"
+
+
+def test_workbook_counts_once_its_snapshot_is_in_use(automation):
+    (automation.temp_path / "schedule_data.json").write_bytes(SAMPLE_EXPORT.read_bytes())
+    automation.process_pending()
+    assert automation.metrics['runs'] == 1
+
+    # Excel saves the workbook; the reloader has not swapped the new data in yet
+    workbook = automation.workbook_loader.workbook_path
+    workbook.parent.mkdir(parents=True)
+    workbook.write_bytes(b"saved by Excel")
+    automation.process_pending()
+    assert automation.metrics['runs'] == 1
+
+    # Once the new data is in use, the run publishes it
+    automation.workbook = WorkbookSnapshot({'4744 W Quinault': {'Customer Name': 'Smith'}}, [],
+                                           automation.workbook_loader.stamp())
+    automation.process_pending()
+    assert automation.metrics['runs'] == 2
+
+
+def test_lot_pair_edit_is_published(automation, tmp_path):
+    lot_pairs = tmp_path / "lot_pairs.json"
+    lot_pairs.write_text('{"Canal Landing": {"singles": []}}', encoding='utf-8')
+    automation.lot_pairs = LotPairRegistry(lot_pairs)
+    (automation.temp_path / "schedule_data.json").write_bytes(SAMPLE_EXPORT.read_bytes())
+    automation.process_pending()
+    automation.process_pending()
+    assert automation.metrics == {'runs': 1, 'skipped_unchanged': 1}
+
+    # A new lot is added to the registry; the export stays the same
+    lot_pairs.write_text('{"Canal Landing": {"singles": [{"lot": 19, "address": "4744 W Quinault"}]}}',
+                         encoding='utf-8')
+    automation.process_pending()
+
+    assert automation.metrics == {'runs': 2, 'skipped_unchanged': 1}
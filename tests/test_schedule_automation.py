@@ -0,0 +1,53 @@
+# test_schedule_automation.py
+"""
+The one-shot script must process a trigger that was written right before it ran
+(python -m pytest tests)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trigger_queue import TriggerQueue
+
+TRIGGER = "EXPORT_COMPLETE\nTRADE_EMAIL:False\nCUSTOMER_EMAIL:False\n"
+
+
+def make_automation(tmp_path, monkeypatch):
+    pytest.importorskip('pandas')
+    pytest.importorskip('googleapiclient')
+    # The module sets up a log file on import; keep it inside tmp_path
+    monkeypatch.chdir(tmp_path)
+    import schedule_automation
+
+    # Skip __init__: it points at the G: drive and Google Drive
+    automation = schedule_automation.MasterScheduleAutomation.__new__(schedule_automation.MasterScheduleAutomation)
+    automation.base_path = str(tmp_path)
+    automation.temp_path = os.path.join(automation.base_path, "Schedule System", "Temp")
+    automation.public_path = os.path.join(automation.base_path, "Public", "Master Schedule")
+    automation.projects_path = os.path.join(automation.base_path, "Projects", "Active")
+    automation.portals_path = os.path.join(automation.base_path, "Customer Portals")
+    automation.drive_service = None
+    automation.trigger_queue = TriggerQueue(tmp_path / "trigger_queue.db")
+    automation.trigger_settle_seconds = 0.3
+    automation.trigger_max_wait_seconds = 60
+    os.makedirs(automation.temp_path)
+    return automation
+
+
+def test_run_processes_fresh_trigger(tmp_path, monkeypatch):
+    automation = make_automation(tmp_path, monkeypatch)
+    trigger_file = Path(automation.temp_path) / "trigger.txt"
+    trigger_file.write_text(TRIGGER)
+
+    automation.run()
+
+    assert not trigger_file.exists()
+    assert automation.trigger_queue.pending_count() == 0
+    schedule_file = Path(automation.projects_path) / "346-354 - Smith Residence" / "Customer_Data" / "Schedule" / "project_schedule.json"
+    assert schedule_file.exists()
+    automation.trigger_queue.close()
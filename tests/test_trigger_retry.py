@@ -0,0 +1,63 @@
+# test_trigger_retry.py
+"""
+Trigger handling of the automation: a run that fails must leave its trigger
+queued so the next run retries it, and a burst of triggers becomes one run
+(python -m pytest tests)
+"""
+
+import time
+from pathlib import Path
+
+import schedule_automation_enhanced as automation_module
+
+TRIGGER = "EXPORT_COMPLETE\nTRADE_EMAIL:True\nCUSTOMER_EMAIL:False\n"
+EXPORT_ONLY_TRIGGER = "EXPORT_COMPLETE\nTRADE_EMAIL:False\nCUSTOMER_EMAIL:False\n"
+TRUNCATED_EXPORT = '{"export_date": "2025-08-26 14:16:03", "projects": [{"project_id": "4744", "schedule": ['
+SAMPLE_EXPORT = Path(__file__).resolve().parent.parent / "schedule_data.json"
+
+
+def test_malformed_export_keeps_trigger_pending(automation):
+    # Truncated mid-write, as when Excel is still saving the export
+    (automation.temp_path / "schedule_data.json").write_text(TRUNCATED_EXPORT, encoding='utf-8')
+    (automation.temp_path / "trigger.txt").write_text(TRIGGER)
+
+    automation.process_pending()
+
+    assert automation.trigger_queue.pending_count() == 1
+    assert not (automation.public_path / "schedule_data.json").exists()
+    assert automation.metrics['runs'] == 0
+
+
+def test_retried_trigger_completes_once_export_is_readable(automation):
+    export = automation.temp_path / "schedule_data.json"
+    export.write_text(TRUNCATED_EXPORT, encoding='utf-8')
+    (automation.temp_path / "trigger.txt").write_text(TRIGGER)
+    automation.process_pending()
+
+    export.write_bytes(SAMPLE_EXPORT.read_bytes())
+    automation.process_pending()
+
+    assert automation.trigger_queue.pending_count() == 0
+    assert (automation.public_path / "schedule_data.json").exists()
+    assert automation.metrics['runs'] == 1
+
+
+def test_trigger_burst_is_one_run(automation, monkeypatch):
+    monkeypatch.setitem(automation_module.CONFIG, 'TRIGGER_SETTLE_SECONDS', 0.3)
+    export = automation.temp_path / "schedule_data.json"
+
+    # Three exports in quick succession, each woken up by the watcher
+    for _ in range(3):
+        export.write_bytes(SAMPLE_EXPORT.read_bytes())
+        (automation.temp_path / "trigger.txt").write_text(EXPORT_ONLY_TRIGGER)
+        automation.process_pending()
+    assert automation.trigger_queue.pending_count() == 3
+    assert automation.metrics['runs'] == 0
+
+    # The monitoring loop wakes up once the burst has settled
+    time.sleep(automation.trigger_wait())
+    automation.process_pending()
+
+    assert automation.trigger_queue.pending_count() == 0
+    assert automation.metrics['runs'] == 1
+    assert automation.metrics['skipped_unchanged'] == 0
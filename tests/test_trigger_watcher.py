@@ -0,0 +1,33 @@
+# test_trigger_watcher.py
+"""
+Writes to files the watcher does not watch must not end a wait early
+(python -m pytest tests)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trigger_watcher import TriggerWatcher
+
+
+def test_unwatched_files_do_not_end_the_timeout(tmp_path):
+    with TriggerWatcher(tmp_path, ['schedule_data.json', 'trigger.txt']) as watcher:
+        # What the trigger queue leaves behind after claiming trigger.txt
+        (tmp_path / "trigger.txt.queued").write_text("EXPORT_COMPLETE\n")
+
+        started = time.monotonic()
+        changed = watcher.wait(timeout=0.3)
+
+        assert changed == set()
+        assert time.monotonic() - started >= 0.3
+
+
+def test_watched_file_ends_the_wait(tmp_path):
+    with TriggerWatcher(tmp_path, ['schedule_data.json', 'trigger.txt'], debounce=0.05) as watcher:
+        (tmp_path / "trigger.txt.queued").write_text("EXPORT_COMPLETE\n")
+        (tmp_path / "trigger.txt").write_text("EXPORT_COMPLETE\n")
+
+        assert watcher.wait(timeout=5) == {'trigger.txt'}
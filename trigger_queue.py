@@ -0,0 +1,209 @@
+# trigger_queue.py
+"""
+Durable queue for the trigger files written by the Excel export macro
+Every trigger.txt is recorded in a local SQLite database as soon as it is
+seen, so quick successive exports are never lost. Adjacent export-only
+triggers are coalesced into a single run, and a run that was interrupted
+is picked up again on the next start.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from pathlib import Path
+
+EMAIL_KEYS = ('TRADE_EMAIL', 'CUSTOMER_EMAIL')
+
+
+def parse_trigger_lines(lines):
+    """Parse 'KEY:value' lines of a trigger file into a dict"""
+    trigger_data = {}
+    for line in lines:
+        if ':' in line:
+            key, value = line.strip().split(':', 1)
+            trigger_data[key] = value
+    return trigger_data
+
+
+def wants_email(trigger_data):
+    """True if the trigger asks for trade partner or customer emails"""
+    return any(trigger_data.get(key) == 'True' for key in EMAIL_KEYS)
+
+
+class TriggerBatch:
+    """One or more queued triggers that are processed as a single run"""
+
+    def __init__(self, trigger_ids, data):
+        self.trigger_ids = trigger_ids
+        self.data = data
+
+    @property
+    def batch_id(self):
+        return self.trigger_ids[0]
+
+    def __len__(self):
+        return len(self.trigger_ids)
+
+
+class TriggerQueue:
+    """SQLite-backed queue of trigger events"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS triggers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                received_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                batch_id INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_triggers_status ON triggers (status, id)")
+
+        # Anything still marked running belongs to a run that crashed - resume it
+        resumed = self.conn.execute(
+            "UPDATE triggers SET status = 'pending', batch_id = NULL WHERE status = 'running'"
+        ).rowcount
+        if resumed:
+            logging.warning(f"Resuming {resumed} trigger(s) from an interrupted run")
+
+    def ingest_file(self, trigger_file):
+        """
+        Move a trigger file into the queue
+
+        The file is renamed out of the macro's way before it is read, so a new
+        export can write the next trigger.txt while this one is being queued.
+
+        Returns:
+            bool: True if a trigger was queued
+        """
+        trigger_file = Path(trigger_file)
+        claimed_file = trigger_file.with_name(trigger_file.name + '.queued')
+
+        queued = False
+        # A leftover .queued file means we stopped between rename and insert
+        for path, rename in ((claimed_file, False), (trigger_file, True)):
+            try:
+                if rename:
+                    os.replace(trigger_file, claimed_file)
+                with open(claimed_file, 'r') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logging.error(f"Failed to read trigger file {path}: {e}")
+                continue
+
+            self.enqueue(parse_trigger_lines(lines))
+            os.remove(claimed_file)
+            queued = True
+
+        return queued
+
+    def enqueue(self, trigger_data):
+        """Record one trigger event"""
+        cursor = self.conn.execute(
+            "INSERT INTO triggers (received_at, data) VALUES (?, ?)",
+            (time.time(), json.dumps(trigger_data))
+        )
+        logging.info(f"Queued trigger #{cursor.lastrowid} ({self.pending_count()} pending)")
+        return cursor.lastrowid
+
+    def pending_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM triggers WHERE status = 'pending'").fetchone()[0]
+
+    def settle_remaining(self, settle=0.0, max_wait=None):
+        """
+        Seconds until claim(settle, max_wait) returns the pending triggers
+
+        Returns:
+            float: 0 if a batch can be claimed now, None if nothing is pending
+        """
+        oldest, newest = self.conn.execute(
+            "SELECT MIN(received_at), MAX(received_at) FROM triggers WHERE status = 'pending'"
+        ).fetchone()
+        if oldest is None:
+            return None
+
+        now = time.time()
+        remaining = newest + settle - now
+        if max_wait is not None:
+            remaining = min(remaining, oldest + max_wait - now)
+        return max(remaining, 0.0)
+
+    def claim(self, settle=0.0, max_wait=None):
+        """
+        Claim the next batch of pending triggers
+
+        Adjacent export-only triggers are merged into one batch; a trigger that
+        asks for emails closes the batch (its flags apply to the merged run).
+
+        Args:
+            settle: Only claim once the newest pending trigger is this many
+                    seconds old, so a burst of exports becomes one run
+            max_wait: Claim anyway once the oldest pending trigger is this old
+
+        Returns:
+            TriggerBatch or None
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT id, received_at, data FROM triggers WHERE status = 'pending' ORDER BY id"
+            ).fetchall()
+            if not rows:
+                self.conn.execute("COMMIT")
+                return None
+
+            now = time.time()
+            settling = now - rows[-1][1] < settle
+            overdue = max_wait is not None and now - rows[0][1] >= max_wait
+            if settling and not overdue:
+                self.conn.execute("COMMIT")
+                return None
+
+            trigger_ids = []
+            merged = {}
+            for trigger_id, _received_at, data in rows:
+                trigger_data = json.loads(data)
+                trigger_ids.append(trigger_id)
+                for key, value in trigger_data.items():
+                    if key in EMAIL_KEYS and merged.get(key) == 'True':
+                        continue
+                    merged[key] = value
+                if wants_email(trigger_data):
+                    break
+
+            self.conn.executemany(
+                "UPDATE triggers SET status = 'running', batch_id = ? WHERE id = ?",
+                [(trigger_ids[0], trigger_id) for trigger_id in trigger_ids]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        if len(trigger_ids) > 1:
+            logging.info(f"Coalesced {len(trigger_ids)} triggers into one run")
+        return TriggerBatch(trigger_ids, merged)
+
+    def complete(self, batch):
+        """Remove a successfully processed batch from the queue"""
+        self.conn.execute("DELETE FROM triggers WHERE batch_id = ?", (batch.batch_id,))
+
+    def release(self, batch):
+        """Return a failed batch to the queue so the next run retries it"""
+        self.conn.execute(
+            "UPDATE triggers SET status = 'pending', batch_id = NULL WHERE batch_id = ?",
+            (batch.batch_id,)
+        )
+
+    def close(self):
+        self.conn.close()
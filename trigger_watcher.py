@@ -0,0 +1,197 @@
+# trigger_watcher.py
+"""
+Filesystem watcher for the VBA export folder
+Wakes the automation as soon as Excel finishes writing an export instead of
+sleep-polling. Uses inotify on Linux and falls back to stat polling elsewhere
+(Windows / Google Drive mounts).
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+from pathlib import Path
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _InotifyBackend:
+    """Directory watch through the Linux inotify API (via ctypes)"""
+
+    name = 'inotify'
+
+    def __init__(self, watch_dir):
+        import ctypes
+        import ctypes.util
+
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(str(watch_dir)), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {watch_dir}")
+
+    def read(self, timeout):
+        """Return the set of file names touched within `timeout` seconds"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+
+        names = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Portable fallback - compares (mtime, size) of the watched files"""
+
+    name = 'polling'
+
+    def __init__(self, watch_dir, filenames, poll_interval):
+        self.watch_dir = Path(watch_dir)
+        self.filenames = list(filenames)
+        self.poll_interval = poll_interval
+        self.signatures = {name: self._signature(name) for name in self.filenames}
+
+    def _signature(self, name):
+        try:
+            st = os.stat(self.watch_dir / name)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def read(self, timeout):
+        """Return the set of watched files that changed within `timeout` seconds"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            names = set()
+            for name in self.filenames:
+                signature = self._signature(name)
+                if signature != self.signatures[name]:
+                    self.signatures[name] = signature
+                    if signature is not None:
+                        names.add(name)
+            if names:
+                return names
+
+            if deadline is None:
+                wait = self.poll_interval
+            else:
+                wait = min(self.poll_interval, deadline - time.monotonic())
+                if wait <= 0:
+                    return set()
+            time.sleep(wait)
+
+    def close(self):
+        pass
+
+
+class TriggerWatcher:
+    """Blocks until the VBA export (or trigger file) has been written"""
+
+    def __init__(self, watch_dir, filenames, debounce=0.2, max_delay=2.0, poll_interval=0.25):
+        """
+        Args:
+            watch_dir: Folder the Excel macro exports into (Schedule System/Temp)
+            filenames: File names inside watch_dir that should wake the watcher
+            debounce: Quiet period (seconds) that marks the end of a write burst
+            max_delay: Upper bound on how long a continuous burst can delay a run
+            poll_interval: Stat interval for the polling fallback
+        """
+        self.watch_dir = Path(watch_dir)
+        self.filenames = set(filenames)
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self._backend = None
+        if sys.platform.startswith('linux'):
+            try:
+                self._backend = _InotifyBackend(self.watch_dir)
+            except OSError as e:
+                logging.warning(f"inotify unavailable ({e}) - falling back to polling")
+        if self._backend is None:
+            self._backend = _PollingBackend(self.watch_dir, self.filenames, poll_interval)
+
+    @property
+    def backend(self):
+        return self._backend.name
+
+    def wait(self, timeout=None):
+        """
+        Wait for a burst of writes to one of the watched files to finish
+
+        Returns:
+            set: Watched file names that changed, empty if `timeout` expired
+        """
+        # Events for other files (trigger.txt.queued, the PDF) do not end the wait
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return changed
+            changed = self._relevant(self._backend.read(remaining))
+
+        # Debounce: keep collecting until the writer has been quiet for a moment
+        now = time.monotonic()
+        give_up = now + self.max_delay
+        quiet_until = now + self.debounce
+        while now < quiet_until and now < give_up:
+            more = self._relevant(self._backend.read(min(quiet_until, give_up) - now))
+            now = time.monotonic()
+            if more:
+                changed |= more
+                quiet_until = now + self.debounce
+
+        return changed
+
+    def _relevant(self, names):
+        return names & self.filenames
+
+    def close(self):
+        self._backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,156 @@
+# web_data_cache.py
+"""
+Incremental builder for the dashboard JSON documents
+Keeps every project entry together with its serialized JSON so a new export
+only recomputes and re-serializes the projects whose inputs changed. The
+rendered text is byte-identical to json.dump(document, f, indent=2).
+"""
+
+import json
+import hashlib
+
+
+def project_digest(*parts):
+    """Digest of the inputs an entry is built from (project dicts, strings, ...)"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _fragment(entry):
+    """Serialize one entry as it appears at depth 2 of an indent=2 document"""
+    return json.dumps(entry, indent=2).replace('\n', '\n    ')
+
+
+class ProjectEntryCache:
+    """Built entries of one document ('projects' map plus phase summary)"""
+
+    def __init__(self, count_duplicates=False):
+        """
+        Args:
+            count_duplicates: Count a phase for every item passed to update()
+                              (individual view) instead of once per final key
+                              (combined view)
+        """
+        self.count_duplicates = count_duplicates
+        self.stats = {'reused': 0, 'rebuilt': 0}
+
+        self._entries = {}      # key -> (digest, entry, fragment)
+        self._order = []        # keys in document order
+        self._key_phases = {}   # key -> tuple of phases counted for that key
+        self._phase_counts = {}
+        self._counted = []      # phases in counting order (drives summary key order)
+
+    def update(self, items):
+        """
+        Bring the cache in line with a new export
+
+        Args:
+            items: Iterable of (key, digest, build) in document order; build() is
+                   only called when the key is new or its digest changed
+        """
+        entries = {}
+        order = []
+        key_phases = {}
+        counted = []
+
+        for key, digest, build in items:
+            record = entries.get(key) or self._entries.get(key)
+            if record and record[0] == digest:
+                self.stats['reused'] += 1
+            else:
+                entry = build()
+                record = (digest, entry, _fragment(entry))
+                self.stats['rebuilt'] += 1
+
+            if key not in entries:
+                order.append(key)
+            entries[key] = record
+
+            if self.count_duplicates:
+                phase = record[1]['current_phase']
+                key_phases[key] = key_phases.get(key, ()) + (phase,)
+                counted.append(phase)
+
+        if not self.count_duplicates:
+            for key in order:
+                phase = entries[key][1]['current_phase']
+                key_phases[key] = (phase,)
+                counted.append(phase)
+
+        # Apply phase count deltas for keys that changed, appeared or vanished
+        for key, phases in key_phases.items():
+            previous = self._key_phases.get(key, ())
+            if phases != previous:
+                self._adjust(previous, -1)
+                self._adjust(phases, 1)
+        for key, previous in self._key_phases.items():
+            if key not in key_phases:
+                self._adjust(previous, -1)
+
+        self._entries = entries
+        self._order = order
+        self._key_phases = key_phases
+        self._counted = counted
+
+    def _adjust(self, phases, delta):
+        for phase in phases:
+            count = self._phase_counts.get(phase, 0) + delta
+            if count:
+                self._phase_counts[phase] = count
+            else:
+                self._phase_counts.pop(phase, None)
+
+    def phase_summary(self):
+        """Phase counts in first-seen order, matching a full rebuild"""
+        remaining = len(self._phase_counts)
+        phases = {}
+        for phase in self._counted:
+            if remaining == 0:
+                break
+            if phase not in phases:
+                phases[phase] = self._phase_counts[phase]
+                remaining -= 1
+        return phases
+
+    def __len__(self):
+        return len(self._order)
+
+    def projects(self):
+        """The 'projects' map of the document"""
+        return {key: self._entries[key][1] for key in self._order}
+
+    def document(self, last_updated, total_projects):
+        """Full document as a dict"""
+        return {
+            'lastUpdated': last_updated,
+            'projects': self.projects(),
+            'summary': {
+                'totalProjects': total_projects,
+                'phases': self.phase_summary()
+            }
+        }
+
+    def render(self, last_updated, total_projects):
+        """Full document as indent=2 JSON text, reusing cached entry fragments"""
+        if self._order:
+            projects = '{\n' + ',\n'.join(
+                f'    {json.dumps(key)}: {self._entries[key][2]}' for key in self._order
+            ) + '\n  }'
+        else:
+            projects = '{}'
+
+        summary = json.dumps({
+            'totalProjects': total_projects,
+            'phases': self.phase_summary()
+        }, indent=2).replace('\n', '\n  ')
+
+        return (
+            '{\n'
+            f'  "lastUpdated": {json.dumps(last_updated)},\n'
+            f'  "projects": {projects},\n'
+            f'  "summary": {summary}\n'
+            '}'
+        )
@@ -0,0 +1,95 @@
+# wire_format.py
+"""
+Compact columnar (v2) encoding of schedule_data_combined.json
+Task names and phases are stored once in dictionaries, dates as day offsets
+from a base date, and each project's schedule as parallel arrays:
+
+    {
+      "version": 2,
+      "lastUpdated": "...",
+      "baseDate": "2025-06-02",
+      "tasks": ["LVP", "Trim", ...],
+      "phases": ["flooring", "finishing", ...],
+      "projects": [
+        {"key": "...", "community": "...", ..., "day": [0, 1, ...], "task": [0, 0, ...], "phase": [0, 0, ...]}
+      ],
+      "summary": {...}
+    }
+
+A date that is not ISO formatted is kept as-is in the "day" array.
+The dashboards decode this back into the v1 shape (see decodeScheduleData).
+"""
+
+from date_ordinals import NO_DATE, date_ordinal, ordinal_text
+
+WIRE_VERSION = 2
+
+
+def encode_combined(document):
+    """
+    Encode a v1 combined document ({'lastUpdated', 'projects', 'summary'})
+
+    Returns:
+        dict: The v2 document
+    """
+    task_codes = {}
+    phase_codes = {}
+
+    known = [date_ordinal(item.get('date'))
+             for project in document['projects'].values()
+             for item in project.get('schedule', [])]
+    known = [o for o in known if o != NO_DATE]
+    base = min(known) if known else None
+
+    projects = []
+    for key, project in document['projects'].items():
+        row = {'key': key}
+        row.update((field, value) for field, value in project.items() if field != 'schedule')
+
+        days, tasks, phases = [], [], []
+        for item in project.get('schedule', []):
+            value = item.get('date')
+            day = date_ordinal(value)
+            days.append(value if day == NO_DATE else day - base)
+            tasks.append(task_codes.setdefault(item.get('task'), len(task_codes)))
+            phases.append(phase_codes.setdefault(item.get('phase'), len(phase_codes)))
+        row['day'] = days
+        row['task'] = tasks
+        row['phase'] = phases
+        projects.append(row)
+
+    return {
+        'version': WIRE_VERSION,
+        'lastUpdated': document['lastUpdated'],
+        'baseDate': ordinal_text(base) if base is not None else None,
+        'tasks': list(task_codes),
+        'phases': list(phase_codes),
+        'projects': projects,
+        'summary': document['summary']
+    }
+
+
+def decode_combined(encoded):
+    """Inverse of encode_combined (v1 documents are returned unchanged)"""
+    if encoded.get('version') != WIRE_VERSION:
+        return encoded
+
+    base = date_ordinal(encoded['baseDate']) if encoded['baseDate'] else 0
+    tasks = encoded['tasks']
+    phases = encoded['phases']
+
+    projects = {}
+    for row in encoded['projects']:
+        project = {field: value for field, value in row.items() if field not in ('key', 'day', 'task', 'phase')}
+        project['schedule'] = [
+            {
+                'date': ordinal_text(base + day) if isinstance(day, int) else day,
+                'task': tasks[task],
+                'phase': phases[phase]
+            }
+            for day, task, phase in zip(row['day'], row['task'], row['phase'])
+        ]
+        projects[row['key']] = project
+
+    return {'lastUpdated': encoded['lastUpdated'], 'projects': projects, 'summary': encoded['summary']}
+
@@ -0,0 +1,227 @@
+# workbook_grid.py
+"""
+Schedule grid ingest straight from Master Schedule.xlsm
+Python version of ExportScheduleDataToJSON (Enhanced_Export_Master_Schedule.bas):
+reads the master schedule sheet with openpyxl in read-only mode, streaming
+the rows once (iter_rows, values only), and yields the same project entries
+the VBA JSON export contains, so Excel no longer has to build the export
+cell by cell.
+
+Layout of the exported range (top-left cell = the macro's selection start):
+
+    row 1-2   community (two rows, joined with a space)
+    row 3     address ('346/354' for a duplex -> one project per unit)
+    row 4     street
+    row 5     lots ('Lots 81/82')
+    row 6     square footage
+    row 7     features
+    row 8+    schedule: one row per day, date in column D, task per project
+
+The first column of the range holds labels; projects start in the next
+column. Hidden columns (projects) and hidden schedule rows are skipped like
+the macro does. Read-only openpyxl does not report hidden rows / columns, so
+those flags come from a second, attribute-only pass over the sheet's XML.
+"""
+
+import re
+import zipfile
+from datetime import date, datetime
+from xml.etree import ElementTree
+
+from date_ordinals import NO_DATE, date_ordinal
+from task_categories import TaskCategorizer, EXPORT_PHASE_KEYWORDS
+
+# Selection start of the export macro (single cell = to the end of the sheet)
+DEFAULT_RANGE = 'D2'
+
+# The macro always takes the date from column D
+DATE_COLUMN = 4
+HEADER_ROWS = 7
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PACKAGE_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_SQFT = re.compile(r'\d{4}')
+_WEEKDAYS = ('M ', 'T ', 'W ', 'Th ', 'F ')
+_DATE_FORMATS = ('%m/%d/%Y', '%m/%d/%y', '%d-%b-%Y', '%d-%b-%y', '%B %d, %Y', '%b %d, %Y')
+
+_categorizer = TaskCategorizer(EXPORT_PHASE_KEYWORDS)
+
+
+def _text(value):
+    """Cell value as text, like CStr() in the macro"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'True' if value else 'False'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime) and not (value.hour or value.minute or value.second):
+        value = value.date()
+    if isinstance(value, date):
+        return f"{value.month}/{value.day}/{value.year}"
+    return str(value)
+
+
+def _schedule_date(value):
+    """Schedule date as YYYY-MM-DD (FormatScheduleDate); unparsable text is returned as is"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+
+    text = _text(value)
+    if date_ordinal(text) != NO_DATE:
+        return text
+
+    # 'M 9-Jun' style labels: drop the weekday, assume the current year
+    cleaned = text
+    for weekday in _WEEKDAYS:
+        cleaned = cleaned.replace(weekday, '')
+    cleaned = cleaned.strip()
+    if '-' in cleaned and len(cleaned) < 10:
+        cleaned = f"{cleaned}-{date.today().year}"
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+
+def _unit_lot(lots, unit_index):
+    """Lot of one duplex unit ('Lots 81/82', 1 -> '82'), like ExtractLotNumber"""
+    lots = lots.replace('Lots', '').strip(' ')
+    if '/' in lots:
+        parts = lots.split('/')
+        return (parts[unit_index] if unit_index < len(parts) else parts[0]).strip(' ')
+    return lots
+
+
+def _square_feet(sqft):
+    match = _SQFT.search(sqft)
+    return match.group() if match else sqft
+
+
+def _sheet_part(archive, title):
+    """Path of a worksheet's XML inside the workbook archive"""
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    relations = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in relations.iter(f'{_PACKAGE_NS}Relationship')}
+    for sheet in workbook.iter(f'{_MAIN_NS}sheet'):
+        if sheet.get('name') == title:
+            target = targets[sheet.get(f'{_REL_NS}id')]
+            return target[1:] if target.startswith('/') else 'xl/' + target
+    raise KeyError(f"Sheet {title!r} not found")
+
+
+def hidden_lines(workbook_path, title):
+    """
+    Hidden columns and rows of a worksheet
+
+    Returns:
+        (set of column numbers, set of row numbers), 1-based like openpyxl
+    """
+    columns, rows = set(), set()
+    with zipfile.ZipFile(workbook_path) as archive:
+        with archive.open(_sheet_part(archive, title)) as f:
+            row_number = 0
+            for event, element in ElementTree.iterparse(f, events=('start', 'end')):
+                tag = element.tag
+                if event == 'start':
+                    if tag == f'{_MAIN_NS}row':
+                        row_number = int(element.get('r') or row_number + 1)
+                        if element.get('hidden') in ('1', 'true'):
+                            rows.add(row_number)
+                    elif tag == f'{_MAIN_NS}col' and element.get('hidden') in ('1', 'true'):
+                        columns.update(range(int(element.get('min')), int(element.get('max')) + 1))
+                elif tag == f'{_MAIN_NS}row':
+                    # Only attributes are needed; drop the cells as we go
+                    element.clear()
+    return columns, rows
+
+
+def iter_grid_projects(workbook_path, sheet=None, cell_range=DEFAULT_RANGE):
+    """
+    Projects of the master schedule grid, in export order (column, then duplex unit)
+
+    Args:
+        workbook_path: Master Schedule.xlsm
+        sheet: Sheet name (None = the active sheet)
+        cell_range: Exported range ('D2:BZ300'), or its top-left cell to read to the end of the sheet
+
+    Yields:
+        dict: One project in the VBA export shape (project_id, address, community,
+              lots, sqft, features, column_index, schedule)
+    """
+    import openpyxl
+    from openpyxl.utils import range_boundaries
+
+    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    if (min_col, min_row) == (max_col, max_row):
+        max_col = max_row = None
+
+    workbook = openpyxl.load_workbook(workbook_path, read_only=True, data_only=True, keep_vba=False)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        hidden_columns, hidden_rows = hidden_lines(workbook_path, worksheet.title)
+
+        # Rows are read from column D or the range start, whichever is further left
+        first_col = min(min_col, DATE_COLUMN)
+        rows = worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=first_col,
+                                   max_col=max_col, values_only=True)
+
+        def cell(row, col):
+            index = col - first_col
+            return row[index] if index < len(row) else None
+
+        header = [next(rows, ()) for _ in range(HEADER_ROWS)]
+        last_col = max_col or first_col + max(len(row) for row in header) - 1
+
+        # Project columns: (column, header texts, schedule items)
+        columns = []
+        for col in range(min_col + 1, last_col + 1):
+            if col in hidden_columns:
+                continue
+            texts = [_text(cell(row, col)) for row in header]
+            if texts[2] not in ('', '0'):
+                columns.append((col, texts, []))
+
+        # One pass over the schedule rows fills every project's schedule
+        for row_number, row in enumerate(rows, start=min_row + HEADER_ROWS):
+            if row_number in hidden_rows:
+                continue
+            date_value = cell(row, DATE_COLUMN)
+            if _text(date_value) == '':
+                continue
+            schedule_date = None
+            for col, _, schedule in columns:
+                task = _text(cell(row, col))
+                if task and task != '0':
+                    if schedule_date is None:
+                        schedule_date = _schedule_date(date_value)
+                    schedule.append({
+                        'date': schedule_date,
+                        'task': task.strip(' '),
+                        'phase': _categorizer.categorize(task)
+                    })
+    finally:
+        workbook.close()
+
+    for col, texts, schedule in columns:
+        community = f"{texts[0]} {texts[1]}".strip(' ')
+        street = texts[3].strip(' ')
+        for unit_index, unit in enumerate(texts[2].split('/')):
+            unit = unit.strip(' ')
+            yield {
+                'project_id': unit,
+                'address': f"{unit} {street}",
+                'community': community,
+                'lots': _unit_lot(texts[4], unit_index),
+                'sqft': _square_feet(texts[5]),
+                'features': texts[6].strip(' '),
+                'column_index': col - min_col - 1,
+                'schedule': [dict(item) for item in schedule]
+            }
@@ -0,0 +1,268 @@
+# workbook_loader.py
+"""
+Single-pass loader for the Customers and Contacts sheets of Master Schedule.xlsm
+The macro-enabled workbook is opened once with openpyxl in read-only mode and
+both sheets are streamed row by row (iter_rows, values only), instead of
+parsing the whole workbook once per sheet through pandas.
+
+The result is kept in a JSON sidecar next to the other automation state,
+stamped with the workbook's modification time and size; as long as the
+workbook is not touched, a start reads the sidecar and never opens the .xlsm.
+
+    customers: {address: {column: value, ...}}    (Customers sheet, keyed by 'Address')
+    contacts:  [{column: value, ...}, ...]        (Contacts sheet, one record per row)
+
+Empty cells are left out of the records (so .get() defaults apply) and
+dates are stored as ISO text, which keeps cold and warm starts identical.
+
+For the long-running daemon, WorkbookReloader re-reads the workbook in a
+background thread when it changes and publishes an immutable
+WorkbookSnapshot that the automation swaps in between runs.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import date, datetime, time
+from pathlib import Path
+from types import MappingProxyType
+
+from output_writer import write_atomic
+from address_keys import AddressIndex
+
+CUSTOMERS_SHEET = 'Customers'
+CONTACTS_SHEET = 'Contacts'
+ADDRESS_COLUMN = 'Address'
+
+# Bump when the sidecar layout or the cell normalization changes
+CACHE_VERSION = 1
+
+
+def _cell(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value if value.strip() else None
+    return value
+
+
+def _records(rows):
+    """Header row + data rows -> list of {column: value} (blank rows skipped)"""
+    header = None
+    records = []
+    for row in rows:
+        if header is None:
+            # Columns without a heading are not data
+            header = [str(name).strip() if name is not None else None for name in row]
+            continue
+        record = {}
+        for name, value in zip(header, row):
+            value = _cell(value)
+            if name and value is not None:
+                record[name] = value
+        if record:
+            records.append(record)
+    return records
+
+
+def _customers(records):
+    customers = {}
+    for record in records:
+        address = record.pop(ADDRESS_COLUMN, None)
+        if address is None:
+            continue
+        customers[str(address)] = record
+    return customers
+
+
+class WorkbookLoader:
+    """Customers / Contacts of the master workbook, cached by (mtime, size)"""
+
+    def __init__(self, workbook_path, cache_path):
+        """
+        Args:
+            workbook_path: Master Schedule.xlsm
+            cache_path: JSON sidecar for the parsed sheets
+        """
+        self.workbook_path = Path(workbook_path)
+        self.cache_path = Path(cache_path)
+
+    def stamp(self):
+        """(mtime_ns, size) of the workbook, None if it does not exist"""
+        try:
+            st = os.stat(self.workbook_path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _read_cache(self, stamp):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable workbook cache {self.cache_path}: {e}")
+            return None
+        if cached.get('version') != CACHE_VERSION or cached.get('stamp') != stamp:
+            return None
+        return cached
+
+    def _write_cache(self, stamp, customers, contacts):
+        data = json.dumps({
+            'version': CACHE_VERSION,
+            'workbook': str(self.workbook_path),
+            'stamp': stamp,
+            'customers': customers,
+            'contacts': contacts
+        }, default=str).encode('utf-8')
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.cache_path, data)
+        except OSError as e:
+            logging.warning(f"Could not write workbook cache {self.cache_path}: {e}")
+
+    def _parse(self):
+        """Open the workbook once and stream both sheets"""
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(self.workbook_path, read_only=True, data_only=True, keep_vba=False)
+        try:
+            sheets = {}
+            for name in (CUSTOMERS_SHEET, CONTACTS_SHEET):
+                if name in workbook.sheetnames:
+                    sheets[name] = _records(workbook[name].iter_rows(values_only=True))
+                else:
+                    logging.warning(f"{name} sheet not found in Excel")
+                    sheets[name] = []
+        finally:
+            # Read-only workbooks keep the file open until closed
+            workbook.close()
+        return _customers(sheets[CUSTOMERS_SHEET]), sheets[CONTACTS_SHEET]
+
+    def read(self, stamp):
+        """
+        Customers and contacts of the workbook version `stamp` (see stamp()),
+        from the sidecar if it holds that version, else parsed from the workbook
+
+        Returns:
+            (customers, contacts)
+
+        Raises:
+            Whatever openpyxl raises for a missing, locked or half-written workbook
+        """
+        cached = self._read_cache(stamp)
+        if cached is not None:
+            logging.info(f"Workbook unchanged, using cached customer/contact data ({self.cache_path.name})")
+            return cached['customers'], cached['contacts']
+
+        customers, contacts = self._parse()
+
+        # Saved against the stamp taken before parsing: a workbook saved
+        # meanwhile simply misses the cache next time
+        self._write_cache(stamp, customers, contacts)
+        logging.info(f"Loaded {len(customers)} customers and {len(contacts)} contacts from {self.workbook_path.name}")
+        return customers, contacts
+
+
+class WorkbookSnapshot:
+    """
+    Read-only customer / contact tables of one workbook version
+
+    Runs hold on to one snapshot from start to end; a reload builds a new
+    snapshot and swaps the reference, so nothing ever sees a half-loaded
+    table. The customer address index is built with the snapshot (off the
+    hot path when the reloader builds it).
+    """
+
+    __slots__ = ('customers', 'contacts', 'stamp', 'customer_index')
+
+    def __init__(self, customers, contacts, stamp=None):
+        """
+        Args:
+            customers: {address: {column: value}}
+            contacts: [{column: value}]
+            stamp: Workbook (mtime_ns, size) the data was read from, None if unknown
+        """
+        self.customers = MappingProxyType({
+            address: MappingProxyType(dict(record)) for address, record in customers.items()
+        })
+        self.contacts = tuple(MappingProxyType(dict(record)) for record in contacts)
+        self.stamp = stamp
+        self.customer_index = AddressIndex(self.customers)
+
+    def __reduce__(self):
+        # Mapping proxies do not pickle; batch workers get plain copies
+        return (WorkbookSnapshot, (
+            {address: dict(record) for address, record in self.customers.items()},
+            [dict(record) for record in self.contacts],
+            self.stamp
+        ))
+
+
+class WorkbookReloader:
+    """
+    Background thread that re-reads the workbook after it changes
+
+    The workbook's stamp is polled every `interval` seconds. A new version is
+    read once its stamp has held still for one interval (Excel saves in
+    several steps); the resulting snapshot is published in `snapshot` for the
+    automation to pick up between runs. A version that cannot be read is
+    logged and skipped until the file changes again, and the previous data
+    stays in use.
+    """
+
+    def __init__(self, loader, snapshot, interval=30):
+        """
+        Args:
+            loader: WorkbookLoader of the workbook to watch
+            snapshot: WorkbookSnapshot currently in use
+            interval: Seconds between checks
+        """
+        self.loader = loader
+        self.snapshot = snapshot
+        self.interval = interval
+        self.reloads = 0
+        self._seen = None
+        self._failed = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='workbook-reloader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def check(self):
+        """Poll once; True if a new snapshot was published"""
+        stamp = self.loader.stamp()
+        if stamp is None or stamp == self.snapshot.stamp or stamp == self._failed:
+            return False
+        if stamp != self._seen:
+            self._seen = stamp
+            return False
+
+        try:
+            customers, contacts = self.loader.read(stamp)
+            snapshot = WorkbookSnapshot(customers, contacts, stamp)
+        except Exception as e:
+            logging.error(f"Could not reload {self.loader.workbook_path.name}, keeping the previous customer/contact data: {e}")
+            self._failed = stamp
+            return False
+
+        self.snapshot = snapshot
+        self.reloads += 1
+        logging.info(f"Reloaded customer/contact data ({len(snapshot.customers)} customers, {len(snapshot.contacts)} contacts)")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Workbook reloader: {e}")